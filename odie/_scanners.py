@@ -0,0 +1,59 @@
+"""
+Compiled column scanners (optional Numba)
+=========================================
+
+The `where` engine answers most numeric comparisons with a NumPy mask over
+the columnar copies in `Indices`. That builds a few temporary arrays per
+comparison (NaN replacement, boolean mask, fancy index). When Numba is
+installed, `scan_ids` instead runs one compiled loop that reads each
+candidate's value, compares it and writes the survivors straight into a
+preallocated output buffer.
+
+Numba is optional: if it is not installed, `scan_ids` is None and the engine
+keeps using the NumPy path.
+"""
+
+from __future__ import annotations
+from typing import Optional, Callable
+import numpy as np
+
+# Operator codes understood by the kernel
+OP_CODES = {"==": 0, "!=": 1, ">=": 2, "<=": 3, ">": 4, "<": 5}
+
+def _scan_ids_py(ids, col, op, v, missing):
+    """Return the IDs in `ids` whose `col` value satisfies `<value> <op> v`.
+
+    NaN values compare as `missing`: the engine passes -1, the value
+    engine._field_key gives missing numbers (NaN is what engine._null_mask finds).
+    `ids` is sorted, so the output is sorted too.
+    """
+    out = np.empty(ids.size, dtype=np.int32)
+    n = 0
+    for i in range(ids.size):
+        eid = ids[i]
+        x = col[eid]
+        if x != x:  # NaN
+            x = missing
+        if op == 0:
+            ok = x == v
+        elif op == 1:
+            ok = x != v
+        elif op == 2:
+            ok = x >= v
+        elif op == 3:
+            ok = x <= v
+        elif op == 4:
+            ok = x > v
+        else:
+            ok = x < v
+        if ok:
+            out[n] = eid
+            n += 1
+    return out[:n]
+
+scan_ids: Optional[Callable] = None
+try:
+    from numba import njit
+    scan_ids = njit(cache=True, nogil=True)(_scan_ids_py)
+except ImportError:  # Numba not installed: the engine uses NumPy masks
+    scan_ids = None
@@ -18,7 +18,7 @@ an in-memory selection of records.
 from __future__ import annotations
 import argparse, shlex
 from .loader import load_emdat_xlsx
-from .indices import build_indices
+from .indices import build_indices, prefix_values
 from .engine import ODIE
 
 # -----------------------------
@@ -78,6 +78,7 @@ Commands:
   where "<expr>"
     - boolean expression: AND / OR, parentheses
     - operators: == != >= <= > < contains
+    - constants: TRUE, FALSE, 1 = 1 (always-true clauses leave the selection as is)
     Example:
       where "country == 'India' AND disaster_type == 'Flood' AND start_year >= 2000 AND start_year <= 2020 AND total_deaths > 100"
 
@@ -87,7 +88,7 @@ Commands:
   sort <field> [merge|quick] [asc|desc]
   topk <k> <field>
   export "<path.csv>"
-  bench "<Country>" "<Disaster Type>" <y1> <y2>
+  bench "<Country>" "<Disaster Type>" <y1> <y2> [rounds]
   report "<path.docx>" [current|full]
   show [n]
   quit
@@ -114,11 +115,13 @@ def main():
     """
     ap = argparse.ArgumentParser()
     ap.add_argument("--xlsx", required=True, help="Path to EM-DAT excel export")
+    ap.add_argument("--shared", action="store_true",
+                    help="Keep columnar indices in shared memory (parallel bench)")
     args = ap.parse_args()
 
     print("Loading dataset...")
     events = load_emdat_xlsx(args.xlsx)
-    idx = build_indices(events)
+    idx = build_indices(events, shared=args.shared)
     engine = ODIE(events=events, idx=idx)
     engine.dataset_path = args.xlsx
 
@@ -155,7 +158,7 @@ def handle(engine: ODIE, line: str) -> None:
     if line.lower().startswith("where "):
         expr = line[len("where "):].strip()
         engine.where(expr)
-        print(f"Applied where-filter. Size={len(engine.state.active_ids)}")
+        print(f"Applied where-filter. Size={engine.state.count}")
         return
 
     parts = shlex.split(line)
@@ -166,7 +169,7 @@ def handle(engine: ODIE, line: str) -> None:
         return
 
     if cmd == "stats":
-        print(f"Current result size: {len(engine.state.active_ids)}")
+        print(f"Current result size: {engine.state.count}")
         print(f"Countries: {len(engine.idx.by_country)} | Types: {len(engine.idx.by_type)} | Years: {len(engine.idx.years_sorted)}")
         return
 
@@ -186,15 +189,14 @@ def handle(engine: ODIE, line: str) -> None:
     if cmd == "values":
         field = parts[1].lower()
         prefix = parts[2] if len(parts) >= 3 else ""
-        if field == "country":
-            vals = sorted(engine.idx.by_country.keys())
-        elif field == "type":
-            vals = sorted(engine.idx.by_type.keys())
-        else:
+        if field not in ("country", "type"):
             raise ValueError("values field must be: country | type")
         if prefix:
-            p = prefix.lower()
-            vals = [v for v in vals if v.lower().startswith(p)]
+            vals = prefix_values(engine.idx, field, prefix)
+        elif field == "country":
+            vals = sorted(engine.idx.by_country.keys())
+        else:
+            vals = sorted(engine.idx.by_type.keys())
         for v in vals[:50]:
             print(v)
         if len(vals) > 50:
@@ -204,11 +206,11 @@ def handle(engine: ODIE, line: str) -> None:
     if cmd == "filter":
         kind = parts[1].lower()
         if kind == "country":
-            c = parts[2]; engine.filter_country(c); print(f"Filtered country={c}. Size={len(engine.state.active_ids)}"); return
+            c = parts[2]; engine.filter_country(c); print(f"Filtered country={c}. Size={engine.state.count}"); return
         if kind == "type":
-            t = parts[2]; engine.filter_type(t); print(f"Filtered type={t}. Size={len(engine.state.active_ids)}"); return
+            t = parts[2]; engine.filter_type(t); print(f"Filtered type={t}. Size={engine.state.count}"); return
         if kind == "year":
-            y1, y2 = int(parts[2]), int(parts[3]); engine.filter_year_range(y1,y2); print(f"Filtered years {y1}-{y2}. Size={len(engine.state.active_ids)}"); return
+            y1, y2 = int(parts[2]), int(parts[3]); engine.filter_year_range(y1,y2); print(f"Filtered years {y1}-{y2}. Size={engine.state.count}"); return
         raise ValueError("filter kind must be: country, type, year")
 
     if cmd == "sort":
@@ -266,7 +268,7 @@ def handle(engine: ODIE, line: str) -> None:
         if len(out_path) >= 2 and out_path[0] in ('"', "'") and out_path[-1] == out_path[0]:
             out_path = out_path[1:-1]
 
-        if not engine.state.active_ids:
+        if engine.state.count == 0:
             print("Nothing to export: current selection is empty.")
             return
 
@@ -285,13 +287,16 @@ def handle(engine: ODIE, line: str) -> None:
 
     if cmd == "bench":
         c, t, y1, y2 = parts[1], parts[2], int(parts[3]), int(parts[4])
-        res = engine.bench(c, t, y1, y2)
-        print(f"naive={res['naive_ms']:.3f}ms | indexed={res['indexed_ms']:.3f}ms")
+        rounds = int(parts[5]) if len(parts) >= 6 else 30
+        res = engine.bench(c, t, y1, y2, rounds=rounds)
+        print(f"python_naive={res['naive_ms']:.3f}ms | naive_vec={res['naive_vec_ms']:.3f}ms | indexed={res['indexed_ms']:.3f}ms")
+        for name in ("naive", "naive_vec", "indexed"):
+            print(f"  {name}: min={res[name + '_min_ms']:.3f} median={res[name + '_median_ms']:.3f} max={res[name + '_max_ms']:.3f} ms")
         return
 
     if cmd == "show":
         n = int(parts[1]) if len(parts) >= 2 else 10
-        rows = [engine.events[i] for i in engine.state.active_ids[:n]]
+        rows = [engine.events[i] for i in engine.state.head(n)]
         _print_rows(rows); return
 
     print("Unknown command. Type 'help'.")
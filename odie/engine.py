@@ -11,27 +11,95 @@ This is the heart of the project. ODIE works like a tiny offline "analytics engi
 5) Generate reports from the current selection
 
 DSA topics demonstrated here:
-- Indices with sorted ID lists (supports fast intersection)
-- Merge sort / quick sort for sorting records
-- Heap (top-k) queries via `heapq`
+- Indices with sorted ID arrays (supports fast intersection/union in NumPy)
+- Sorting with a stable argsort over columnar copies (merge sort / quick sort
+  from dsa.py for the classroom path)
+- Top-k queries via partial selection (`np.argpartition`)
 - Undo/redo stacks (history of selections)
+- Bitsets for dense selections (packed uint64 words)
 - Graph/search concepts (optional: where expressions as an AST)
 """
 
 from __future__ import annotations
 from dataclasses import dataclass, field
-from typing import List, Optional, Tuple, Callable, Dict, Any
-import heapq, time
+from typing import List, Optional, Tuple, Callable, Dict, Any, Deque, Iterator
+from collections import deque
+import os, time
+import numpy as np
+from bisect import bisect_left, bisect_right
 from .models import DisasterEvent
-from .indices import Indices, year_range_ids
-from .dsa import merge_sort, quick_sort, intersect_sorted
-from .query_lang import parse, Node, And, Or, Cmp
+from .indices import Indices, year_range_ids, contains_ids, attach_shared, EMPTY_IDS
+from .dsa import merge_sort, quick_sort, ids_to_bitset, bitset_to_ids, bitset_test, bitset_count, intersect_bitset
+from .query_lang import parse, compile_predicate, Node, And, Or, Cmp, Const
+from ._scanners import scan_ids, OP_CODES
 
 @dataclass
 class QueryState:
-    """Holds the current working set of event IDs (like a view)."""
-    active_ids: List[int]
+    """Holds the current working set of event IDs (like a view).
+
+    Invariant: `active_ids` is always sorted ascending with no duplicates.
+    It starts as `arange(n)` and every mutator (intersect, union, masked
+    scan, undo/redo snapshots) preserves the order, so filters never need
+    to re-sort it.
+
+    Storage: a sparse selection is kept as the sorted int32 IDs themselves;
+    once it holds more than n / 8 events it is packed into a uint64 bitset
+    (`repr_ == "bitset"`), which is smaller and lets filters test membership
+    with a bit lookup. `active_ids` always returns the sorted ID form, which
+    unpacks a bitset (O(n)); use `count` for the size and `head(k)` for the
+    first few IDs instead.
+    """
+    selection: np.ndarray  # sorted int32 event IDs, or a uint64 bitset when dense
+    n_total: int           # number of events in the table
     last_sort: Optional[Tuple[str, str, bool]] = None
+    is_full: bool = False  # selection == every event (after reset, or undo back to it)
+    count: int = 0         # number of selected events (kept in step with `selection`)
+
+    @classmethod
+    def from_ids(cls, ids: np.ndarray, n_total: int) -> "QueryState":
+        state = cls(selection=EMPTY_IDS, n_total=n_total)
+        state.active_ids = ids
+        return state
+
+    @property
+    def repr_(self) -> str:
+        return "bitset" if _is_bitset(self.selection) else "ids"
+
+    @property
+    def active_ids(self) -> np.ndarray:
+        return _as_ids(self.selection)
+
+    @active_ids.setter
+    def active_ids(self, ids: np.ndarray) -> None:
+        self.selection = _pack_selection(ids, self.n_total)
+        # IDs are unique and < n_total, so "all events" is a count check
+        self.count = bitset_count(ids) if _is_bitset(ids) else len(ids)
+        self.is_full = self.count == self.n_total
+
+    def head(self, k: int) -> np.ndarray:
+        """The first `k` selected IDs, without unpacking the whole bitset."""
+        sel = self.selection
+        if not _is_bitset(sel):
+            return sel[:k]
+        # IDs are in word order: unpack a doubling prefix until it holds k of them
+        words = 1
+        while True:
+            ids = bitset_to_ids(sel[:words])
+            if len(ids) >= k or words >= len(sel):
+                return ids[:k]
+            words *= 2
+
+@dataclass
+class _HistoryEntry:
+    """One mutating command on the undo stack.
+
+    `before` is the selection the command started from. It is only kept on
+    every `snapshot_every`-th entry (and on the oldest one); the others are
+    rebuilt by replaying commands forward from the nearest snapshot.
+    """
+    op: str
+    args: Tuple[Any, ...]
+    before: Optional[np.ndarray] = None
 
 @dataclass
 class ODIE:
@@ -52,187 +120,496 @@ class ODIE:
     command_log: List[str] = field(default_factory=list)
     state: QueryState = field(init=False)
 
-    # Stacks for undo/redo (store snapshots of active_ids)
-    _undo: List[List[int]] = field(default_factory=list, init=False)
-    _redo: List[List[int]] = field(default_factory=list, init=False)
+    # Undo history bounds: at most `max_history` commands, and at most
+    # `max_history_bytes` of stored selections (oldest entries drop first)
+    max_history: int = 64
+    max_history_bytes: int = 64 * 1024 * 1024
+    snapshot_every: int = 8
+
+    # Stacks for undo/redo: commands (op, args) rather than full selections
+    _undo: Deque[_HistoryEntry] = field(default_factory=deque, init=False)
+    _redo: List[Tuple[str, Tuple[Any, ...]]] = field(default_factory=list, init=False)
 
     def __post_init__(self) -> None:
-        self.state = QueryState(active_ids=list(range(len(self.events))))
+        self.state = QueryState.from_ids(self._all_ids(), len(self.events))
+
+    def _all_ids(self) -> np.ndarray:
+        return np.arange(len(self.events), dtype=np.int32)
 
     # ---------------- History (Stacks) ----------------
-    def _push_history(self) -> None:
-        self._undo.append(self.state.active_ids[:])
-        self._redo.clear()
+    def _push_history(self, op: str, args: Tuple[Any, ...]) -> None:
+        """Record a command about to be applied to the current selection."""
+        entry = _HistoryEntry(op, args)
+        gap = 0  # entries since the last snapshot
+        for e in reversed(self._undo):
+            if e.before is not None:
+                break
+            gap += 1
+        if not self._undo or gap >= self.snapshot_every - 1:
+            # Arrays are never modified in place, so keeping a reference is enough
+            # (dense selections are stored as bitsets, n / 8 bytes each)
+            entry.before = self.state.selection
+        self._undo.append(entry)
+        self._trim_history()
+
+    def _trim_history(self) -> None:
+        # Summed once, then kept up to date as entries are dropped / snapshotted
+        stored_bytes = sum(e.before.nbytes for e in self._undo if e.before is not None)
+        while len(self._undo) > 1 and (len(self._undo) > self.max_history
+                                       or stored_bytes > self.max_history_bytes):
+            oldest = self._undo.popleft()
+            stored_bytes -= oldest.before.nbytes  # the oldest entry always has a snapshot
+            # The new oldest entry must carry a snapshot to replay from
+            if self._undo[0].before is None:
+                self._undo[0].before = _pack_selection(
+                    self._run_op(oldest.op, oldest.args, oldest.before), len(self.events))
+                stored_bytes += self._undo[0].before.nbytes
+
+    def _state_before(self, j: int) -> np.ndarray:
+        """Rebuild the selection (IDs or bitset) as it was before undo entry `j`."""
+        i = j
+        while self._undo[i].before is None:
+            i -= 1
+        ids = self._undo[i].before
+        for k in range(i, j):
+            e = self._undo[k]
+            ids = self._run_op(e.op, e.args, ids)
+        return ids
 
     def undo(self) -> bool:
         if not self._undo:
             return False
-        self._redo.append(self.state.active_ids[:])
-        self.state.active_ids = self._undo.pop()
+        prev = self._state_before(len(self._undo) - 1)
+        entry = self._undo.pop()
+        self._redo.append((entry.op, entry.args))
+        self.state.active_ids = prev
         return True
 
     def redo(self) -> bool:
         if not self._redo:
             return False
-        self._undo.append(self.state.active_ids[:])
-        self.state.active_ids = self._redo.pop()
+        op, args = self._redo.pop()
+        new_ids = self._run_op(op, args, self.state.selection, self.state.is_full)
+        self._push_history(op, args)
+        self.state.active_ids = new_ids
         return True
 
+    def _apply(self, op: str, *args: Any) -> None:
+        """Run a mutating command on the selection and record it for undo."""
+        new_ids = self._run_op(op, args, self.state.selection, self.state.is_full)
+        self._push_history(op, args)
+        self._redo.clear()
+        if op == "reset":
+            self.state = QueryState.from_ids(new_ids, len(self.events))
+        else:
+            self.state.active_ids = new_ids
+
+    def _run_op(self, op: str, args: Tuple[Any, ...], sel: np.ndarray, full: bool = False) -> np.ndarray:
+        """Apply one command to a selection (IDs or bitset) and return the new selection.
+
+        The result is sorted IDs, or a bitset when both sides were dense.
+        `full` says `sel` holds every event: a posting-list filter is then the
+        posting list itself, with no intersection. Pure: no history is recorded.
+        """
+        if op == "reset":
+            return self._all_ids()
+        if op in ("filter_country", "filter_type", "filter_year_range"):
+            if op == "filter_country":
+                posting = self.idx.by_country.get(args[0], EMPTY_IDS)
+            elif op == "filter_type":
+                posting = self.idx.by_type.get(args[0], EMPTY_IDS)
+            else:
+                posting = year_range_ids(self.idx, args[0], args[1])
+            # Posting lists are never modified in place, so sharing one is safe
+            return posting if full else _intersect_selection(sel, posting, len(self.events))
+        if op == "where":
+            node = parse(args[0])
+            if _is_bitset(sel) and self._is_cheap(node):
+                # Dense selection, whole-table answer: AND the two bitsets
+                return _intersect_selection(sel, self._full_ids(node, {}), len(self.events))
+            return self._eval_node(node, _as_ids(sel), {})
+        raise ValueError(f"Unknown history op: {op}")
+
     # ---------------- Filters ----------------
     def reset(self) -> None:
         """Reset selection to all events."""
-        self._push_history()
-        self.state = QueryState(active_ids=list(range(len(self.events))))
+        self._apply("reset")
 
     def filter_country(self, country: str) -> None:
         """Filter current selection to a specific country."""
-        self._push_history()
-        ids = self.idx.by_country.get(country, [])
-        self.state.active_ids = intersect_sorted(sorted(self.state.active_ids), ids)
+        self._apply("filter_country", country)
 
     def filter_type(self, dtype: str) -> None:
         """Filter current selection to a disaster type (e.g., Earthquake)."""
-        self._push_history()
-        ids = self.idx.by_type.get(dtype, [])
-        self.state.active_ids = intersect_sorted(sorted(self.state.active_ids), ids)
+        self._apply("filter_type", dtype)
 
     def filter_year_range(self, y1: int, y2: int) -> None:
-        self._push_history()
-        ids = year_range_ids(self.idx, y1, y2)
-        self.state.active_ids = intersect_sorted(sorted(self.state.active_ids), ids)
+        self._apply("filter_year_range", y1, y2)
 
     def where(self, expr: str) -> None:
         """Apply boolean expression to current result set."""
-        self._push_history()
-        ast = parse(expr)
-        self.state.active_ids = self._eval_node(ast, self.state.active_ids)
+        if _const_eval(parse(expr)) is True:
+            return  # always-true clause (TRUE, 1 = 1): nothing to filter or undo
+        self._apply("where", expr)
 
     # ---------------- Query language evaluation ----------------
-    def _eval_node(self, node: Node, candidate_ids: List[int]) -> List[int]:
+    # Leaves that an index or a columnar copy can answer ("cheap" leaves) are
+    # evaluated over the whole table and combined bottom-up with NumPy set
+    # operations. Leaves that need the Python predicate are evaluated top-down
+    # on the surviving candidates only, so they touch as few events as possible.
+    def _eval_node(self, node: Node, candidate_ids: np.ndarray,
+                   leaf_cache: Optional[Dict[Cmp, np.ndarray]] = None) -> np.ndarray:
+        if leaf_cache is None:
+            leaf_cache = {}
+        const = _const_eval(node)
+        if const is not None:
+            return candidate_ids if const else EMPTY_IDS
+        if isinstance(node, (And, Or)) and not self._has_cheap_leaf(node):
+            # Nothing to gain from set operations: one fused scan of the candidates
+            return self._scan(compile_predicate(node), candidate_ids)
         if isinstance(node, And):
-            left_ids = self._eval_node(node.left, candidate_ids)
-            return self._eval_node(node.right, left_ids)
+            # Most selective conjunct first: later ones see fewer candidates
+            conjuncts = sorted(_flatten_and(node), key=self._estimate_selectivity)
+            for c in conjuncts:
+                if len(candidate_ids) == 0:
+                    break
+                candidate_ids = self._eval_node(c, candidate_ids, leaf_cache)
+            return candidate_ids
         if isinstance(node, Or):
-            left_ids = self._eval_node(node.left, candidate_ids)
-            right_ids = self._eval_node(node.right, candidate_ids)
-            return _union_sorted(left_ids, right_ids)
+            disjuncts = _flatten_or(node)
+            cheap = [d for d in disjuncts if self._is_cheap(d)]
+            rest = [d for d in disjuncts if not self._is_cheap(d)]
+            # Cheap disjuncts: one bottom-up union over the whole table
+            matched = EMPTY_IDS
+            if cheap:
+                full = _union_all([self._full_ids(d, leaf_cache) for d in cheap], len(self.events))
+                matched = np.intersect1d(candidate_ids, full, assume_unique=True)
+            # Others, least selective first: each only tests what is still unmatched
+            remaining = np.setdiff1d(candidate_ids, matched, assume_unique=True) if rest else EMPTY_IDS
+            for d in sorted(rest, key=self._estimate_selectivity, reverse=True):
+                if len(remaining) == 0:
+                    break
+                hit = self._eval_node(d, remaining, leaf_cache)
+                matched = np.union1d(matched, hit)
+                remaining = np.setdiff1d(remaining, hit, assume_unique=True)
+            return matched
         if isinstance(node, Cmp):
             return self._apply_cmp(node, candidate_ids)
         raise ValueError("Unknown AST node")
 
-    def _apply_cmp(self, cmp: Cmp, candidate_ids: List[int]) -> List[int]:
+    def _is_cheap(self, node: Node) -> bool:
+        """True if every leaf under `node` has an index or columnar path."""
+        if isinstance(node, (And, Or)):
+            return self._is_cheap(node.left) and self._is_cheap(node.right)
+        if isinstance(node, Cmp):
+            return _index_path(node) or self._vector_plan(node) is not None
+        return isinstance(node, Const)
+
+    def _full_ids(self, node: Node, leaf_cache: Dict[Cmp, np.ndarray]) -> np.ndarray:
+        """Bottom-up: all event IDs (whole table) matching a cheap subtree."""
+        const = _const_eval(node)
+        if const is not None:
+            return self._all_ids() if const else EMPTY_IDS
+        if isinstance(node, And):
+            parts = sorted(_flatten_and(node), key=self._estimate_selectivity)
+            ids = self._full_ids(parts[0], leaf_cache)
+            for c in parts[1:]:
+                if len(ids) == 0:
+                    break
+                ids = np.intersect1d(ids, self._full_ids(c, leaf_cache), assume_unique=True)
+            return ids
+        if isinstance(node, Or):
+            return _union_all([self._full_ids(d, leaf_cache) for d in _flatten_or(node)], len(self.events))
+        if node not in leaf_cache:
+            ids = self._index_ids(node)
+            if ids is None:
+                ids = self._vector_scan(node, self._all_ids())
+            leaf_cache[node] = ids
+        return leaf_cache[node]
+
+    def _estimate_selectivity(self, node: Node) -> float:
+        """Estimate the fraction of all events that satisfy `node` (0..1).
+
+        Uses index sizes where possible (country/type posting lists, year
+        slabs) and fixed guesses per operator otherwise.
+        """
+        n = len(self.events)
+        if n == 0:
+            return 0.0
+        if isinstance(node, And):
+            p = 1.0
+            for c in _flatten_and(node):
+                p *= self._estimate_selectivity(c)
+            return p
+        if isinstance(node, Or):
+            q = 1.0
+            for d in _flatten_or(node):
+                q *= 1.0 - self._estimate_selectivity(d)
+            return 1.0 - q
+        if isinstance(node, Const):
+            return 1.0 if node.value else 0.0
+        if not isinstance(node, Cmp):
+            return 0.5
+
+        field = node.field.lower()
+        op = node.op
+        posting = None
+        if field == "country":
+            posting = self.idx.by_country
+        elif field in ("type", "disaster_type"):
+            posting = self.idx.by_type
+        if posting is not None and op in ("==", "!="):
+            p = len(posting.get(str(node.value), EMPTY_IDS)) / n
+            return p if op == "==" else 1.0 - p
+
+        if field in ("start_year", "year") and op in ("==", "!=", ">=", ">", "<=", "<"):
+            try:
+                v = int(node.value)
+            except (TypeError, ValueError):
+                return _DEFAULT_SELECTIVITY.get(op, 0.5)
+            years = self.idx.years_sorted
+            lo, hi = {
+                "==": (v, v), "!=": (v, v),
+                ">=": (v, None), ">": (v + 1, None),
+                "<=": (None, v), "<": (None, v - 1),
+            }[op]
+            i = bisect_left(years, lo) if lo is not None else 0
+            j = bisect_right(years, hi) if hi is not None else len(years)
+            count = int(self.idx.year_offsets[j] - self.idx.year_offsets[i]) if i < j else 0
+            return 1.0 - count / n if op == "!=" else count / n
+
+        return _DEFAULT_SELECTIVITY.get(op, 0.5)
+
+    def _apply_cmp(self, cmp: Cmp, candidate_ids: np.ndarray) -> np.ndarray:
+        # Index-based paths (country/type equality, start_year constraints)
+        ids = self._index_ids(cmp)
+        if ids is not None:
+            if len(candidate_ids) == len(self.events):
+                return ids  # candidates are every event: nothing to intersect
+            return np.intersect1d(candidate_ids, ids, assume_unique=True)
+
+        # Vectorized scan over the columnar (SoA) copies, when the field has one
+        vec = self._vector_scan(cmp, candidate_ids)
+        if vec is not None:
+            return vec
+
+        # Fallback scan
+        return self._scan(compile_predicate(cmp), candidate_ids)
+
+    def _scan(self, pred: Callable[[DisasterEvent], bool], candidate_ids: np.ndarray) -> np.ndarray:
+        """IDs of the candidates whose event satisfies `pred` (one Python call each)."""
+        # candidate_ids is sorted, so the survivors come out sorted too
+        out: List[int] = []
+        for eid in candidate_ids:
+            if pred(self.events[eid]):
+                out.append(eid)
+        return np.asarray(out, dtype=np.int32)
+
+    def _has_cheap_leaf(self, node: Node) -> bool:
+        """True if some leaf under `node` has an index or columnar path."""
+        if isinstance(node, (And, Or)):
+            return self._has_cheap_leaf(node.left) or self._has_cheap_leaf(node.right)
+        return self._is_cheap(node)
+
+    def _index_ids(self, cmp: Cmp) -> Optional[np.ndarray]:
+        """Sorted IDs for `cmp` straight from an index, or None if no index applies."""
+        if not _index_path(cmp):
+            return None
         field = cmp.field.lower()
         op = cmp.op
 
+        # Trigram index for substring search on country / type
+        if op == "contains":
+            kind = "country" if field == "country" else "type"
+            return contains_ids(self.idx, kind, str(cmp.value))
+
         # Index-based equality for categorical fields
-        if op == "==" and field in ("country", "disaster_type"):
-            ids = self.idx.by_country.get(str(cmp.value), []) if field == "country" else self.idx.by_type.get(str(cmp.value), [])
-            return intersect_sorted(sorted(candidate_ids), ids)
+        if field == "country":
+            return self.idx.by_country.get(str(cmp.value), EMPTY_IDS)
+        if field == "disaster_type":
+            return self.idx.by_type.get(str(cmp.value), EMPTY_IDS)
 
         # Index-based year constraints (start_year)
-        if field in ("start_year", "year"):
-            if op == "==":
-                ids = self.idx.year_to_ids.get(int(cmp.value), [])
-                return intersect_sorted(sorted(candidate_ids), ids)
-            if op in (">=", ">", "<=", "<"):
-                years = self.idx.years_sorted
-                if not years:
-                    return []
-                lo = years[0]; hi = years[-1]
-                v = int(cmp.value)
-                if op == ">=":
-                    lo = v
-                elif op == ">":
-                    lo = v + 1
-                elif op == "<=":
-                    hi = v
-                elif op == "<":
-                    hi = v - 1
-                ids = year_range_ids(self.idx, lo, hi)
-                return intersect_sorted(sorted(candidate_ids), ids)
+        if op == "==":
+            return self.idx.year_to_ids.get(int(cmp.value), EMPTY_IDS)
+        years = self.idx.years_sorted
+        if not years:
+            return EMPTY_IDS
+        lo = years[0]; hi = years[-1]
+        v = int(cmp.value)
+        if op == ">=":
+            lo = v
+        elif op == ">":
+            lo = v + 1
+        elif op == "<=":
+            hi = v
+        elif op == "<":
+            hi = v - 1
+        return year_range_ids(self.idx, lo, hi)
+
+    def _vector_plan(self, cmp: Cmp) -> Optional[Tuple[np.ndarray, Any, Callable]]:
+        """(column, value, ufunc-compare) for a columnar scan of `cmp`, or None."""
+        if cmp.op == "contains" or cmp.fn is None:
+            return None
+        fn = cmp.fn
+        field = cmp.field.lower()
+        val = cmp.value
+        if field in _CATEGORICAL_SOA:
+            if cmp.op not in ("==", "!="):
+                return None
+            codes_name, col_name = _CATEGORICAL_SOA[field]
+            col = getattr(self.idx, col_name)
+            val = getattr(self.idx, codes_name).get(val, -1)
+        elif field in _NUMERIC_SOA:
+            col = getattr(self.idx, _NUMERIC_SOA[field])
+        else:
+            return None
+        return col, val, fn
 
-        # Fallback scan
-        pred = _make_predicate(cmp)
-        out: List[int] = []
-        for eid in candidate_ids:
-            if pred(self.events[eid]):
-                out.append(eid)
-        out.sort()
-        return out
+    def _vector_scan(self, cmp: Cmp, candidate_ids: np.ndarray) -> Optional[np.ndarray]:
+        """Evaluate `cmp` with one NumPy mask over the candidates.
+
+        Returns None when the field/op has no columnar copy (e.g. `contains`,
+        subtype or dis_no), so the caller falls back to the Python scan.
+        """
+        plan = self._vector_plan(cmp)
+        if plan is None:
+            return None
+        col, val, fn = plan
+        cand = np.asarray(candidate_ids, dtype=np.int32)
+        if scan_ids is not None and isinstance(val, (int, float)) and not isinstance(val, bool):
+            # Compiled single-pass scan (Numba installed)
+            return scan_ids(cand, col, OP_CODES[cmp.op], float(val), -1.0)
+        vals = col[cand]
+        if vals.dtype.kind == "f":
+            # Same convention as compile_predicate: missing numbers compare as -1
+            vals = np.where(np.isnan(vals), -1.0, vals)
+        # Masking keeps the candidates' (sorted) order
+        return cand[fn(vals, val)]
 
     # ---------------- Output operations ----------------
-    def _events_from_ids(self, ids: List[int]) -> List[DisasterEvent]:
+    def _iter_events(self, ids: np.ndarray) -> Iterator[DisasterEvent]:
+        """Yield the events for `ids` one at a time (no intermediate list)."""
+        events = self.events
+        for i in ids:
+            yield events[i]
+
+    def _events_from_ids_list(self, ids: np.ndarray) -> List[DisasterEvent]:
+        """Materialize the events for `ids` (for callers that need a list)."""
         return [self.events[i] for i in ids]
 
     def sort(self, field: str, algo: str = "merge", reverse: bool = True) -> List[DisasterEvent]:
-        key = _field_key(field)
-        arr = self._events_from_ids(self.state.active_ids)
-        if algo == "merge":
-            out = merge_sort(arr, key=key, reverse=reverse)
-        elif algo == "quick":
-            out = quick_sort(arr, key=key, reverse=reverse)
-        else:
+        """Return the current selection ordered by `field`.
+
+        Every sort field (deaths, affected, damage, year, date) has a columnar
+        copy, ordered with a stable NumPy argsort (no per-event key calls).
+        Set the environment variable ODIE_DSA_PURE=1 to run the classroom
+        merge sort / quick sort from `dsa.py` instead.
+        """
+        key = _field_key(field)  # also rejects unknown fields
+        if algo not in ("merge", "quick"):
             raise ValueError("algo must be 'merge' or 'quick'")
+        ids = self.state.active_ids
+        if os.environ.get("ODIE_DSA_PURE") == "1":
+            arr = self._events_from_ids_list(ids)
+            sorter = merge_sort if algo == "merge" else quick_sort
+            out = sorter(arr, key=key, reverse=reverse)
+        else:
+            vals = self.idx.col_for(field)[ids]
+            vals = np.where(_null_mask(vals), -1, vals)  # same as _field_key
+            order = np.argsort(-vals if reverse else vals, kind="stable")
+            out = self._events_from_ids_list(ids[order])
         self.state.last_sort = (field, algo, reverse)
         return out
 
     def topk(self, k: int, field: str) -> List[DisasterEvent]:
-        key = _field_key(field)
-        heap: List[tuple] = []
-        for eid in self.state.active_ids:
-            e = self.events[eid]
-            v = key(e)
-            if v is None:
-                continue
-            if len(heap) < k:
-                heapq.heappush(heap, (v, eid))
-            else:
-                if v > heap[0][0]:
-                    heapq.heapreplace(heap, (v, eid))
-        heap.sort(reverse=True)
-        return [self.events[eid] for _, eid in heap]
+        """Return the k largest events by `field` (largest first, ties by event ID).
+
+        Uses `np.argpartition` on the field's columnar copy (O(n), in C) and
+        skips missing values; only the k survivors are fully sorted.
+        """
+        _field_key(field)  # rejects unknown fields
+        ids = self.state.active_ids
+        col = self.idx.col_for(field)
+        v = col[ids]
+        valid = np.flatnonzero(~_null_mask(v))
+        v, ids = v[valid], ids[valid]
+        k = min(k, v.size)
+        if k <= 0:
+            return []
+        # One introselect pass moves the k largest values to the end (O(n))
+        top = np.argpartition(v, v.size - k)[v.size - k:]
+        # Equal values at the cut are picked arbitrarily: keep the lowest event IDs
+        cut = v[top].min()
+        above = np.flatnonzero(v > cut)
+        top = np.concatenate([above, np.flatnonzero(v == cut)[:k - above.size]])
+        # Only the k survivors get fully sorted (largest first)
+        order = top[np.argsort(-v[top], kind="stable")]
+        return [self.events[i] for i in ids[order]]
 
     def export_csv(self, path: str) -> None:
+        """Export the current selection to a CSV file (streamed, one row per event)."""
         import csv
-        rows = self._events_from_ids(self.state.active_ids)
-        with open(path, "w", newline="", encoding="utf-8") as f:
+        with open(path, "w", newline="", encoding="utf-8", buffering=_EXPORT_BUFFER) as f:
             w = csv.writer(f)
             w.writerow(["event_id","dis_no","country","disaster_type","disaster_subtype",
                         "start_year","start_month","start_day",
                         "total_deaths","total_affected","total_damage_adj_usd"])
-            for e in rows:
+            for e in self._iter_events(self.state.active_ids):
                 w.writerow([e.event_id, e.dis_no, e.country, e.disaster_type, e.disaster_subtype,
                             e.start_year, e.start_month, e.start_day,
                             e.total_deaths, e.total_affected, e.total_damage_adj_usd])
 
-    
     def export_json(self, path: str) -> None:
         """Export the current selection to a JSON file.
 
         CSV is great for spreadsheets; JSON is great for programs and preserves field names.
+        The array is written one record at a time (same layout as `json.dump(..., indent=2)`),
+        so no full list of dicts is built in memory.
         """
         import json
-        rows = self._events_from_ids(self.state.active_ids)
-        payload = [
-            {
-                "event_id": e.event_id,
-                "dis_no": e.dis_no,
-                "country": e.country,
-                "disaster_type": e.disaster_type,
-                "disaster_subtype": e.disaster_subtype,
-                "start_year": e.start_year,
-                "start_month": e.start_month,
-                "start_day": e.start_day,
-                "total_deaths": e.total_deaths,
-                "total_affected": e.total_affected,
-                "total_damage_adj_usd": e.total_damage_adj_usd,
-            }
-            for e in rows
-        ]
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(payload, f, ensure_ascii=False, indent=2)
-
-def bench(self, country: str, dtype: str, y1: int, y2: int, rounds: int = 30) -> Dict[str, float]:
+        ids = self.state.active_ids
+        last = len(ids) - 1
+        with open(path, "w", encoding="utf-8", buffering=_EXPORT_BUFFER) as f:
+            if last < 0:
+                f.write("[]")
+                return
+            f.write("[\n")
+            for n, e in enumerate(self._iter_events(ids)):
+                record = {
+                    "event_id": e.event_id,
+                    "dis_no": e.dis_no,
+                    "country": e.country,
+                    "disaster_type": e.disaster_type,
+                    "disaster_subtype": e.disaster_subtype,
+                    "start_year": e.start_year,
+                    "start_month": e.start_month,
+                    "start_day": e.start_day,
+                    "total_deaths": e.total_deaths,
+                    "total_affected": e.total_affected,
+                    "total_damage_adj_usd": e.total_damage_adj_usd,
+                }
+                text = json.dumps(record, ensure_ascii=False, indent=2)
+                f.write("  " + text.replace("\n", "\n  "))
+                f.write(",\n" if n < last else "\n")
+            f.write("]")
+
+    def bench(self, country: str, dtype: str, y1: int, y2: int, rounds: int = 30) -> Dict[str, float]:
+        """Time full-table scans against the index-based filter for the same query.
+
+        Three variants are timed:
+        - naive: Python loop over every DisasterEvent (the textbook scan)
+        - naive_vec: the same scan vectorized over the columnar (SoA) copies
+        - indexed: intersect the country / type posting lists and the year range
+
+        Each round is timed on its own and the result reports the mean plus
+        min / median / max. When the columns live in shared memory
+        (`build_indices(..., shared=True)`) and `rounds > 8`, the naive_vec
+        rounds are split across worker processes that map the same buffers.
+        """
+        c_id = self.idx.country_code.get(country, -1)
+        t_id = self.idx.type_code.get(dtype, -1)
+
         def naive():
             ids = []
             for e in self.events:
@@ -241,38 +618,178 @@ def bench(self, country: str, dtype: str, y1: int, y2: int, rounds: int = 30) ->
             return ids
 
         def indexed():
-            ids = self.idx.by_country.get(country, [])
-            ids = intersect_sorted(ids, self.idx.by_type.get(dtype, []))
-            ids = intersect_sorted(ids, year_range_ids(self.idx, y1, y2))
+            ids = self.idx.by_country.get(country, EMPTY_IDS)
+            ids = np.intersect1d(ids, self.idx.by_type.get(dtype, EMPTY_IDS), assume_unique=True)
+            ids = np.intersect1d(ids, year_range_ids(self.idx, y1, y2), assume_unique=True)
             return ids
 
+        workers = min(os.cpu_count() or 1, rounds)
+        if rounds > 8 and self.idx.shm and workers > 1:
+            from concurrent.futures import ProcessPoolExecutor
+            spec = self.idx.shared_spec()
+            chunks = [len(c) for c in np.array_split(np.arange(rounds), workers)]
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futs = [pool.submit(_bench_naive_vec_rounds, spec, c_id, t_id, y1, y2, r) for r in chunks]
+                vec_times = [t for f in futs for t in f.result()]
+        else:
+            vec_times = _naive_vec_rounds(self.idx.country_id, self.idx.type_id, self.idx.start_year,
+                                          c_id, t_id, y1, y2, rounds)
+
+        out: Dict[str, float] = {}
+        for name, times in (("naive", _time_rounds(naive, rounds)),
+                            ("naive_vec", vec_times),
+                            ("indexed", _time_rounds(indexed, rounds))):
+            arr = np.asarray(times)
+            out[f"{name}_ms"] = float(arr.mean())
+            out[f"{name}_min_ms"] = float(arr.min())
+            out[f"{name}_median_ms"] = float(np.median(arr))
+            out[f"{name}_max_ms"] = float(arr.max())
+        return out
+
+def _time_rounds(fn: Callable[[], Any], rounds: int) -> List[float]:
+    """Call `fn` `rounds` times; return each call's time in ms."""
+    times = []
+    for _ in range(rounds):
         t0 = time.perf_counter()
-        for _ in range(rounds): naive()
-        t1 = time.perf_counter()
-        for _ in range(rounds): indexed()
-        t2 = time.perf_counter()
-        return {"naive_ms": (t1-t0)*1000/rounds, "indexed_ms": (t2-t1)*1000/rounds}
+        fn()
+        times.append((time.perf_counter() - t0) * 1000)
+    return times
+
+def _naive_vec_rounds(cc: np.ndarray, tc: np.ndarray, yr: np.ndarray,
+                      c_id: int, t_id: int, y1: int, y2: int, rounds: int) -> List[float]:
+    """Run the vectorized full scan `rounds` times; return each round's time in ms."""
+    return _time_rounds(lambda: np.flatnonzero((cc == c_id) & (tc == t_id) & (yr >= y1) & (yr <= y2)),
+                        rounds)
+
+def _bench_naive_vec_rounds(spec, c_id, t_id, y1, y2, rounds) -> List[float]:
+    """Worker entry point: attach to the shared columns and run `_naive_vec_rounds`."""
+    cols, blocks = attach_shared(spec)
+    try:
+        return _naive_vec_rounds(cols["country_id"], cols["type_id"], cols["start_year"],
+                                 c_id, t_id, y1, y2, rounds)
+    finally:
+        del cols  # drop the views before closing the mappings
+        for b in blocks:
+            b.close()
 
 # ---------------- Helpers ----------------
-def _union_sorted(left_ids: List[int], right_ids: List[int]) -> List[int]:
-    a = sorted(left_ids); b = sorted(right_ids)
-    i = j = 0
-    out: List[int] = []
-    while i < len(a) and j < len(b):
-        if a[i] == b[j]:
-            out.append(a[i]); i += 1; j += 1
-        elif a[i] < b[j]:
-            out.append(a[i]); i += 1
-        else:
-            out.append(b[j]); j += 1
-    out.extend(a[i:]); out.extend(b[j:])
-    # unique
-    uniq: List[int] = []
-    prev = None
-    for x in out:
-        if prev != x:
-            uniq.append(x); prev = x
-    return uniq
+# A selection switches to a bitset once it holds more than n / _BITSET_DENSITY IDs
+_BITSET_DENSITY = 8
+
+# Write buffer for exports (fewer, larger write syscalls)
+_EXPORT_BUFFER = 1 << 20
+
+# where-field -> (code map, code column) on Indices
+_CATEGORICAL_SOA = {
+    "country": ("country_code", "country_id"),
+    "type": ("type_code", "type_id"),
+    "disaster_type": ("type_code", "type_id"),
+}
+
+# where-field -> numeric column on Indices
+_NUMERIC_SOA = {
+    "start_year": "start_year", "year": "start_year",
+    "total_deaths": "deaths", "deaths": "deaths",
+    "total_affected": "affected", "affected": "affected",
+    "damage": "damage", "damages": "damage", "total_damage_adj_usd": "damage",
+}
+
+# Fallback selectivity guesses per operator (when no index can tell)
+_DEFAULT_SELECTIVITY = {
+    "==": 0.1, "!=": 0.9,
+    ">=": 0.5, ">": 0.5, "<=": 0.5, "<": 0.5,
+    "contains": 0.3,
+}
+
+def _index_path(cmp: Cmp) -> bool:
+    """True if `cmp` can be answered from the posting-list / year indices."""
+    field = cmp.field.lower()
+    if field in ("country", "type", "disaster_type") and cmp.op == "contains":
+        return True
+    if field in ("country", "disaster_type"):
+        return cmp.op == "=="
+    if field in ("start_year", "year"):
+        return cmp.op in ("==", ">=", ">", "<=", "<")
+    return False
+
+def _null_mask(v: np.ndarray) -> np.ndarray:
+    """True where a columnar value is missing (NaN; integer columns have none)."""
+    if v.dtype.kind == "f":
+        return np.isnan(v)
+    return np.zeros(v.shape, dtype=bool)
+
+def _union_all(parts: List[np.ndarray], n: int) -> np.ndarray:
+    """Sorted union of several sorted ID arrays (all < n) in one pass.
+
+    Dense unions mark a bitmap over 0..n-1 (O(n), no sort); sparse ones
+    concatenate and sort.
+    """
+    if not parts:
+        return EMPTY_IDS
+    if len(parts) == 1:
+        return parts[0]
+    if sum(len(p) for p in parts) * _BITSET_DENSITY > n:
+        mask = np.zeros(n, dtype=bool)
+        for p in parts:
+            mask[p] = True
+        return np.flatnonzero(mask).astype(np.int32)
+    return np.unique(np.concatenate(parts))
+
+def _is_bitset(sel: np.ndarray) -> bool:
+    return sel.dtype.kind == "u"
+
+def _as_ids(sel: np.ndarray) -> np.ndarray:
+    """Sorted int32 IDs of a selection stored either way."""
+    return bitset_to_ids(sel) if _is_bitset(sel) else sel
+
+def _pack_selection(sel: np.ndarray, n: int) -> np.ndarray:
+    """Choose the storage for a selection: bitset above n / 8 members, IDs below."""
+    if _is_bitset(sel):
+        return sel
+    if n and len(sel) * _BITSET_DENSITY > n:
+        return ids_to_bitset(sel, n)
+    return sel
+
+def _intersect_selection(sel: np.ndarray, ids: np.ndarray, n: int) -> np.ndarray:
+    """Selection (IDs or bitset) intersected with sorted IDs (all < n).
+
+    Bitset and dense IDs: one word-wise AND, and the result stays a bitset.
+    Bitset and sparse IDs: one bit test per ID. Otherwise a sorted merge.
+    """
+    if _is_bitset(sel):
+        if len(ids) * _BITSET_DENSITY > n:
+            return intersect_bitset(sel, ids_to_bitset(ids, n))
+        # One bit test per posting entry; the posting list is already sorted
+        return ids[bitset_test(sel, ids)] if len(ids) else EMPTY_IDS
+    return np.intersect1d(sel, ids, assume_unique=True)
+
+def _const_eval(node: Node) -> Optional[bool]:
+    """Return True/False if `node` is constant (e.g. TRUE, FALSE AND x), else None."""
+    if isinstance(node, Const):
+        return node.value
+    if isinstance(node, And):
+        vals = [_const_eval(c) for c in _flatten_and(node)]
+        if False in vals:
+            return False
+        return True if all(v is True for v in vals) else None
+    if isinstance(node, Or):
+        vals = [_const_eval(d) for d in _flatten_or(node)]
+        if True in vals:
+            return True
+        return False if all(v is False for v in vals) else None
+    return None
+
+def _flatten_and(node: Node) -> List[Node]:
+    """Collect the operands of a chain of And nodes (left to right)."""
+    if isinstance(node, And):
+        return _flatten_and(node.left) + _flatten_and(node.right)
+    return [node]
+
+def _flatten_or(node: Node) -> List[Node]:
+    """Collect the operands of a chain of Or nodes (left to right)."""
+    if isinstance(node, Or):
+        return _flatten_or(node.left) + _flatten_or(node.right)
+    return [node]
 
 def _field_key(field: str) -> Callable[[DisasterEvent], object]:
     f = field.lower().strip()
@@ -287,41 +804,3 @@ def _field_key(field: str) -> Callable[[DisasterEvent], object]:
     if f in ("date","start_date"):
         return lambda e: e.start_date_key()
     raise ValueError("field must be: deaths, affected, damage, year, date")
-
-def _make_predicate(cmp: Cmp) -> Callable[[DisasterEvent], bool]:
-    field = cmp.field
-    op = cmp.op
-    val = cmp.value
-
-    def get(e: DisasterEvent) -> Any:
-        fname = field.lower()
-        if fname == "country":
-            return e.country
-        if fname in ("type", "disaster_type"):
-            return e.disaster_type
-        if fname in ("subtype", "disaster_subtype"):
-            return e.disaster_subtype
-        if fname in ("start_year","year"):
-            return e.start_year
-        if fname in ("total_deaths","deaths"):
-            return e.total_deaths if e.total_deaths is not None else -1
-        if fname in ("total_affected","affected"):
-            return e.total_affected if e.total_affected is not None else -1
-        if fname in ("damage","total_damage_adj_usd","damages"):
-            return e.total_damage_adj_usd if e.total_damage_adj_usd is not None else -1.0
-        if fname in ("dis_no","disno"):
-            return e.dis_no
-        return getattr(e, fname, None)
-
-    if op == "contains":
-        sval = str(val).lower()
-        return lambda e: sval in str(get(e)).lower()
-
-    if op == "==": return lambda e: get(e) == val
-    if op == "!=": return lambda e: get(e) != val
-    if op == ">=": return lambda e: get(e) >= val
-    if op == "<=": return lambda e: get(e) <= val
-    if op == ">":  return lambda e: get(e) > val
-    if op == "<":  return lambda e: get(e) < val
-
-    raise ValueError(f"Unsupported operator: {op}")
@@ -8,57 +8,276 @@ common filters fast.
 Example:
 - `by_country["India"]` gives a sorted list of row IDs for India.
 - `year_to_ids[2001]` gives IDs for all disasters that started in 2001.
+- `ids_by_year` holds every ID grouped by start year (years ascending), and
+  `year_offsets[i]:year_offsets[i + 1]` is the slab for `years_sorted[i]`,
+  so a year range is one contiguous slice.
 
 Why sorted lists?
 - Sorted ID lists allow fast intersections using the two-pointer technique.
+- The lists are stored as sorted int32 NumPy arrays, so intersections and
+  unions can use `np.intersect1d` / `np.union1d` (the merge runs in C).
+
+Columnar (SoA) copies
+- Next to the maps we also keep one NumPy array per field ("struct of arrays").
+  `start_year[i]` is the start year of event i, `country_id[i]` is an integer
+  code for its country, and so on. Scans over a single field then run as one
+  vectorized C loop instead of touching every `DisasterEvent` object.
+- Missing numeric values are stored as NaN.
+- With `build_indices(events, shared=True)` these arrays live in
+  `multiprocessing.shared_memory` blocks, so worker processes (see
+  `ODIE.bench`) can map the same buffers by name instead of pickling them.
+
+Text lookups
+- `by_country_lc_sorted` is the sorted list of lowercased country names, so
+  `values country <prefix>` is a binary search instead of a scan.
+- `country_trigrams["ind"]` lists the country codes whose (lowercased) name
+  contains "ind". A `contains` query intersects the trigram lists of the
+  search text, then confirms the substring on the few names left.
+- The same two structures exist for disaster types.
 """
 
 from __future__ import annotations
-from dataclasses import dataclass
-from typing import Dict, List
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set, Tuple
 from bisect import bisect_left, bisect_right
-from .models import DisasterEvent
+from multiprocessing import shared_memory
+import atexit, sys
+import numpy as np
+from .models import DisasterEvent, start_date_keys
+
+# Shared "no matches" posting list (used as the default for missing keys)
+EMPTY_IDS = np.empty(0, dtype=np.int32)
+
+# Columnar arrays that can be placed in shared memory
+SOA_FIELDS = ("country_id", "type_id", "start_year", "deaths", "affected", "damage")
+
+# sort/topk field name -> numeric column (same field names as the engine's sort keys)
+_KEY_COLUMNS = {
+    "deaths": "deaths", "total_deaths": "deaths",
+    "affected": "affected", "total_affected": "affected",
+    "damage": "damage", "damages": "damage", "total_damage": "damage", "total_damage_adj_usd": "damage",
+    "year": "start_year", "start_year": "start_year",
+    "date": "start_date", "start_date": "start_date",
+}
 
 @dataclass
 class Indices:
     """Container of precomputed indices for fast filtering."""
-    by_country: Dict[str, List[int]]
-    by_type: Dict[str, List[int]]
-    year_to_ids: Dict[int, List[int]]
+    by_country: Dict[str, np.ndarray]  # sorted int32 event IDs
+    by_type: Dict[str, np.ndarray]
+    year_to_ids: Dict[int, np.ndarray]
     years_sorted: List[int]
+    ids_by_year: np.ndarray   # int32 IDs grouped by year, years ascending
+    year_offsets: np.ndarray  # prefix sums: slab i is ids_by_year[off[i]:off[i+1]]
+
+    # Columnar copies of the hot fields (row i == event_id i)
+    country_code: Dict[str, int]
+    type_code: Dict[str, int]
+    country_id: np.ndarray  # int32 codes into country_code
+    type_id: np.ndarray     # int32 codes into type_code
+    start_year: np.ndarray  # int16
+    deaths: np.ndarray      # float64, NaN = missing
+    affected: np.ndarray    # float64, NaN = missing
+    damage: np.ndarray      # float64, NaN = missing
+    start_date: np.ndarray  # int64 YYYYMMDD keys (DisasterEvent.start_date_key)
+
+    # Prefix search (lowercased keys, sorted) and trigram -> code lists
+    by_country_lc_sorted: List[str]
+    by_country_lc_names: List[str]  # original names, same order
+    by_type_lc_sorted: List[str]
+    by_type_lc_names: List[str]
+    country_trigrams: Dict[str, np.ndarray]  # sorted int32 country codes
+    type_trigrams: Dict[str, np.ndarray]     # sorted int32 type codes
 
-def build_indices(events: List[DisasterEvent]) -> Indices:
+    # Shared-memory blocks backing the SoA columns (empty unless shared=True)
+    shm: Dict[str, shared_memory.SharedMemory] = field(default_factory=dict)
+
+    def col_for(self, field: str) -> Optional[np.ndarray]:
+        """Numeric column for a sort / top-k field name, or None if it has none."""
+        name = _KEY_COLUMNS.get(field.lower().strip())
+        return getattr(self, name) if name is not None else None
+
+    def shared_spec(self) -> Dict[str, Tuple[str, str, int]]:
+        """Describe the shared SoA columns as {field: (block name, dtype, length)}."""
+        return {f: (self.shm[f].name, getattr(self, f).dtype.str, len(getattr(self, f)))
+                for f in self.shm}
+
+def build_indices(events: List[DisasterEvent], shared: bool = False) -> Indices:
     """Build indices from the loaded dataset.
 
+    Args:
+        shared: place the columnar (SoA) arrays in shared memory so that
+            worker processes can attach to them without copying.
+
     Returns:
         Indices object containing maps like by_country, by_type, year_to_ids.
     """
-    by_country: Dict[str, List[int]] = {}
-    by_type: Dict[str, List[int]] = {}
-    year_to_ids: Dict[int, List[int]] = {}
+    by_country: Dict[str, list] = {}
+    by_type: Dict[str, list] = {}
+    year_to_ids: Dict[int, list] = {}
+
+    n = len(events)
+    country_code: Dict[str, int] = {}
+    type_code: Dict[str, int] = {}
+    country_id = np.empty(n, dtype=np.int32)
+    type_id = np.empty(n, dtype=np.int32)
+    start_year = np.empty(n, dtype=np.int16)
+    deaths = np.empty(n, dtype=np.float64)
+    affected = np.empty(n, dtype=np.float64)
+    damage = np.empty(n, dtype=np.float64)
+    month = np.empty(n, dtype=np.float64)
+    day = np.empty(n, dtype=np.float64)
 
+    nan = float("nan")
     for e in events:
         by_country.setdefault(e.country, []).append(e.event_id)
         by_type.setdefault(e.disaster_type, []).append(e.event_id)
         year_to_ids.setdefault(e.start_year, []).append(e.event_id)
 
+        i = e.event_id
+        country_id[i] = country_code.setdefault(e.country, len(country_code))
+        type_id[i] = type_code.setdefault(e.disaster_type, len(type_code))
+        start_year[i] = e.start_year
+        deaths[i] = e.total_deaths if e.total_deaths is not None else nan
+        affected[i] = e.total_affected if e.total_affected is not None else nan
+        damage[i] = e.total_damage_adj_usd if e.total_damage_adj_usd is not None else nan
+        month[i] = e.start_month if e.start_month is not None else nan
+        day[i] = e.start_day if e.start_day is not None else nan
+
+    # Freeze each posting list into a sorted int32 array
     for d in (by_country, by_type, year_to_ids):
-        for k in d:
-            d[k].sort()
+        for k, v in d.items():
+            d[k] = np.sort(np.fromiter(v, dtype=np.int32, count=len(v)))
 
+    # One contiguous array of IDs grouped by year; the per-year entries in
+    # year_to_ids become views into it (no second copy).
     years_sorted = sorted(year_to_ids.keys())
-    return Indices(by_country=by_country, by_type=by_type, year_to_ids=year_to_ids, years_sorted=years_sorted)
+    year_offsets = np.cumsum([0] + [len(year_to_ids[y]) for y in years_sorted]).astype(np.int64)
+    ids_by_year = (np.concatenate([year_to_ids[y] for y in years_sorted])
+                   if years_sorted else EMPTY_IDS.copy())
+    for i, y in enumerate(years_sorted):
+        year_to_ids[y] = ids_by_year[year_offsets[i]:year_offsets[i + 1]]
+
+    country_lc = sorted((k.lower(), k) for k in by_country)
+    type_lc = sorted((k.lower(), k) for k in by_type)
+
+    blocks: Dict[str, shared_memory.SharedMemory] = {}
+    if shared:
+        cols = {"country_id": country_id, "type_id": type_id, "start_year": start_year,
+                "deaths": deaths, "affected": affected, "damage": damage}
+        for name, arr in cols.items():
+            blocks[name], cols[name] = _to_shared(arr)
+        atexit.register(_release_shared, list(blocks.values()))
+        country_id, type_id, start_year = cols["country_id"], cols["type_id"], cols["start_year"]
+        deaths, affected, damage = cols["deaths"], cols["affected"], cols["damage"]
+
+    return Indices(by_country=by_country, by_type=by_type, year_to_ids=year_to_ids, years_sorted=years_sorted,
+                   ids_by_year=ids_by_year, year_offsets=year_offsets,
+                   country_code=country_code, type_code=type_code,
+                   country_id=country_id, type_id=type_id, start_year=start_year,
+                   deaths=deaths, affected=affected, damage=damage,
+                   start_date=start_date_keys(start_year, month, day),
+                   by_country_lc_sorted=[lc for lc, _ in country_lc],
+                   by_country_lc_names=[k for _, k in country_lc],
+                   by_type_lc_sorted=[lc for lc, _ in type_lc],
+                   by_type_lc_names=[k for _, k in type_lc],
+                   country_trigrams=_build_trigrams(country_code),
+                   type_trigrams=_build_trigrams(type_code),
+                   shm=blocks)
+
+def _to_shared(arr: np.ndarray) -> Tuple[shared_memory.SharedMemory, np.ndarray]:
+    """Copy `arr` into a new shared-memory block and return (block, view)."""
+    block = shared_memory.SharedMemory(create=True, size=max(arr.nbytes, 1))
+    view = np.ndarray(arr.shape, dtype=arr.dtype, buffer=block.buf)
+    view[:] = arr
+    return block, view
+
+def _release_shared(blocks: List[shared_memory.SharedMemory]) -> None:
+    for b in blocks:
+        try:
+            b.close()
+        except BufferError:
+            pass  # arrays still map the buffer at exit; unlinking is what matters
+        try:
+            b.unlink()
+        except FileNotFoundError:
+            pass
+
+def attach_shared(spec: Dict[str, Tuple[str, str, int]]) -> Tuple[Dict[str, np.ndarray], List[shared_memory.SharedMemory]]:
+    """Map shared SoA columns (from `Indices.shared_spec`) in another process.
+
+    Returns the arrays and the blocks; close the blocks when done (after
+    dropping the arrays). The creating process owns and unlinks the blocks.
+    """
+    cols: Dict[str, np.ndarray] = {}
+    blocks: List[shared_memory.SharedMemory] = []
+    for f, (name, dtype, n) in spec.items():
+        if sys.version_info >= (3, 13):
+            block = shared_memory.SharedMemory(name=name, track=False)
+        else:
+            block = shared_memory.SharedMemory(name=name)
+        blocks.append(block)
+        cols[f] = np.ndarray((n,), dtype=np.dtype(dtype), buffer=block.buf)
+    return cols, blocks
+
+def _trigrams(s: str) -> Set[str]:
+    return {s[i:i + 3] for i in range(len(s) - 2)}
+
+def _build_trigrams(codes: Dict[str, int]) -> Dict[str, np.ndarray]:
+    """Map each trigram of a lowercased key to the sorted codes of keys containing it."""
+    grams: Dict[str, list] = {}
+    for name, code in codes.items():
+        for g in _trigrams(name.lower()):
+            grams.setdefault(g, []).append(code)
+    return {g: np.array(sorted(v), dtype=np.int32) for g, v in grams.items()}
+
+def prefix_values(idx: Indices, field: str, prefix: str) -> List[str]:
+    """Return the country / disaster type names starting with `prefix` (case-insensitive)."""
+    if field == "country":
+        lc, names = idx.by_country_lc_sorted, idx.by_country_lc_names
+    else:
+        lc, names = idx.by_type_lc_sorted, idx.by_type_lc_names
+    p = prefix.lower()
+    lo = bisect_left(lc, p)
+    hi = bisect_left(lc, p + "\uffff")
+    return sorted(names[lo:hi])
+
+def contains_ids(idx: Indices, field: str, text: str) -> np.ndarray:
+    """Return sorted event IDs whose country / disaster type contains `text` (case-insensitive)."""
+    if field == "country":
+        codes, grams, posting = idx.country_code, idx.country_trigrams, idx.by_country
+    else:
+        codes, grams, posting = idx.type_code, idx.type_trigrams, idx.by_type
+    t = text.lower()
+    names = list(codes)  # insertion order == code order
+    if len(t) >= 3:
+        cand = None
+        for g in _trigrams(t):
+            hit = grams.get(g)
+            if hit is None:
+                return EMPTY_IDS
+            cand = hit if cand is None else np.intersect1d(cand, hit, assume_unique=True)
+        keys = [names[c] for c in cand]
+    else:
+        keys = names
+    # Trigrams only narrow the candidates; confirm the substring itself
+    parts = [posting[k] for k in keys if t in k.lower()]
+    if not parts:
+        return EMPTY_IDS
+    return np.unique(np.concatenate(parts))
 
-def year_range_ids(idx: Indices, y1: int, y2: int) -> List[int]:
+def year_range_ids(idx: Indices, y1: int, y2: int) -> np.ndarray:
     """Return sorted event IDs with start_year in [y1, y2].
 
-    We use binary search on `years_sorted` and then merge the ID lists.
+    We use binary search on `years_sorted`; the matching years are one
+    contiguous slab of `ids_by_year`, which only needs a single sort.
     """
     # Find the slice of years that fall inside the range
     lo = bisect_left(idx.years_sorted, y1)
     hi = bisect_right(idx.years_sorted, y2)
-    out: List[int] = []
-    for y in idx.years_sorted[lo:hi]:
-        out.extend(idx.year_to_ids.get(y, []))
-    out.sort()
-    return out
+    if lo >= hi:
+        return EMPTY_IDS
+    if hi - lo == 1:
+        # A single year's slab is already sorted
+        return idx.ids_by_year[idx.year_offsets[lo]:idx.year_offsets[hi]]
+    return np.sort(idx.ids_by_year[idx.year_offsets[lo]:idx.year_offsets[hi]])
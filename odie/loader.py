@@ -7,108 +7,236 @@ This module reads the EM-DAT Excel export and converts each row into a
 
 Key ideas:
 - We try multiple possible column names because EM-DAT exports may vary.
-- We keep conversion helpers (_to_int/_to_float/_to_str) to safely handle blanks.
-- The loader returns a list of immutable records; ODIE never edits the Excel file.
+- Only the columns ODIE uses are read, with calamine when available
+  (much faster than openpyxl on large exports).
+- Columns are converted whole (_int_col/_float_col/_str_col), so pandas does
+  the blank/invalid handling in C instead of one Python call per cell.
+- `load_emdat_table` returns those columns as a DisasterEventTable (struct of
+  arrays); `load_emdat_xlsx` turns the table into a list of immutable
+  records. ODIE never edits the Excel file.
+- The parsed table is cached as a Parquet sidecar file (see load_emdat_table),
+  since the dataset does not change between runs.
 """
 
 from __future__ import annotations
+from functools import lru_cache
 from typing import List, Optional
+import numpy as np
 import pandas as pd
-import re
-from .models import DisasterEvent
+import os, re
+from .models import DisasterEvent, DisasterEventTable
 
-def _to_int(x) -> Optional[int]:
-    """Convert a cell to int, returning None if missing/invalid."""
-    if pd.isna(x): return None
-    try: return int(float(x))
-    except Exception: return None
+def _float_col(df: pd.DataFrame, col: Optional[str], scale: float = 1.0) -> np.ndarray:
+    """Convert a column to float64, with NaN for missing/invalid cells (or a missing column)."""
+    if col is None:
+        return np.full(len(df), np.nan)
+    vals = pd.to_numeric(df[col], errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+    return vals * scale if scale != 1.0 else vals
 
-def _to_float(x) -> Optional[float]:
-    """Convert a cell to float, returning None if missing/invalid."""
-    if pd.isna(x): return None
-    try: return float(x)
-    except Exception: return None
+def _int_col(df: pd.DataFrame, col: Optional[str]) -> np.ndarray:
+    """Convert a column to whole numbers (truncating), NaN for missing/invalid cells.
 
-def _to_str(x) -> str:
-    if pd.isna(x): return ""
-    return str(x).strip()
+    The result stays float64 so that blanks can be NaN.
+    """
+    vals = np.trunc(_float_col(df, col))
+    vals[~np.isfinite(vals)] = np.nan
+    return vals
+
+def _str_col(df: pd.DataFrame, col: str) -> np.ndarray:
+    """Convert a column to stripped strings, with "" for blanks (object array)."""
+    s = df[col]
+    return s.astype(str).str.strip().where(s.notna(), "").to_numpy(dtype=object)
+
+def _cat_col(df: pd.DataFrame, col: str) -> pd.Categorical:
+    """Like _str_col, stored as a categorical (integer codes + one code book)."""
+    return pd.Categorical(_str_col(df, col))
+
+_NORM_RE = re.compile(r"[^a-z0-9]+")
 
+@lru_cache(maxsize=512)
 def _norm(s: str) -> str:
-    return re.sub(r"[^a-z0-9]+", "", str(s).lower())
-
-def _col(df: pd.DataFrame, *names: str) -> str:
-    cols = list(df.columns)
-    for n in names:
-        if n in cols:
-            return n
-    norm_map = {_norm(c): c for c in cols}
-    for n in names:
-        nn = _norm(n)
-        if nn in norm_map:
-            return norm_map[nn]
-    raise KeyError(f"Missing required column. Tried={names}. Available={cols}")
-
-def _damage_adjusted_column(df: pd.DataFrame) -> Optional[str]:
-    cols = list(df.columns)
-    exact = "Total Damage, Adjusted ('000 US$)"
-    if exact in cols:
-        return exact
-    exact_norm = _norm(exact)
-    for c in cols:
-        if _norm(c) == exact_norm:
-            return c
-    for c in cols:
-        nc = _norm(c)
-        if "totaldamage" in nc and "adjust" in nc:
+    """Header name reduced to lowercase letters and digits (for alias matching)."""
+    return _NORM_RE.sub("", str(s).lower())
+
+class _Header:
+    """The sheet's column names, indexed once for all alias lookups.
+
+    Each lookup is then a few dict probes instead of a scan of the header.
+    """
+    def __init__(self, columns: List[str]) -> None:
+        self.columns = list(columns)
+        self.exact = set(self.columns)
+        self.first_norm: dict = {}  # normalized name -> first column with it
+        self.last_norm: dict = {}   # normalized name -> last column with it
+        for c in self.columns:
+            n = _norm(c)
+            self.first_norm.setdefault(n, c)
+            self.last_norm[n] = c
+        self.pos = {c: i for i, c in enumerate(self.columns)}
+
+    def col(self, *names: str) -> str:
+        """First alias present as is; otherwise first alias matching after normalization."""
+        for n in names:
+            if n in self.exact:
+                return n
+        for n in names:
+            c = self.last_norm.get(_norm(n))
+            if c is not None:
+                return c
+        raise KeyError(f"Missing required column. Tried={names}. Available={self.columns}")
+
+    def exact_col(self, *names: str) -> Optional[str]:
+        """First alias present exactly as written, or None."""
+        return next((n for n in names if n in self.exact), None)
+
+    def first_with_norm(self, *norms: str) -> Optional[str]:
+        """Leftmost column whose normalized name is one of `norms`, or None."""
+        hits = [self.first_norm[n] for n in norms if n in self.first_norm]
+        return min(hits, key=self.pos.__getitem__) if hits else None
+
+    def damage_adjusted_col(self) -> Optional[str]:
+        exact = "Total Damage, Adjusted ('000 US$)"
+        if exact in self.exact:
+            return exact
+        c = self.first_norm.get(_norm(exact))
+        if c is not None:
             return c
-    return None
+        return next((c for c in self.columns
+                     if "totaldamage" in _norm(c) and "adjust" in _norm(c)), None)
 
-def load_emdat_xlsx(path: str) -> List[DisasterEvent]:
+def _excel_engine() -> str:
+    """Prefer the Rust-based calamine reader (python-calamine) when installed.
+
+    pandas only accepts engine="calamine" from 2.2 on; older versions use openpyxl.
+    """
+    import importlib.util
+    if _version_tuple(pd.__version__) < (2, 2):
+        return "openpyxl"
+    return "calamine" if importlib.util.find_spec("python_calamine") is not None else "openpyxl"
+
+def _version_tuple(version: str) -> tuple:
+    """(major, minor) of a version string such as "2.2.3" or "3.0.0rc1"."""
+    return tuple(int(re.match(r"\d*", p).group() or 0) for p in version.split(".")[:2])
+
+def load_emdat_xlsx(path: str, workers: int = 1) -> List[DisasterEvent]:
     """
     Loader tuned for the user's EM-DAT export.
     Note: Total Damage, Adjusted ('000 US$) is converted to US$ by *1000.
+    `workers > 1` builds the records in a process pool (see
+    `DisasterEventTable.to_events`).
+    """
+    return load_emdat_table(path).to_events(workers=workers)
+
+def load_emdat_table(path: str) -> DisasterEventTable:
+    """Load the EM-DAT export as a DisasterEventTable (one array per field).
+
+    Same columns and conversions as `load_emdat_xlsx`, but no per-row
+    objects are created.
+
+    The converted table is cached next to the workbook as `<path>.parquet`
+    (needs pyarrow) and reused while it is newer than the workbook and was
+    written for the same workbook size and cache format version. Set
+    ODIE_PARQUET_CACHE=0 to disable the cache (e.g. read-only folders).
     """
-    df = pd.read_excel(path, engine="openpyxl")
-    df.rename(columns={c: str(c).strip() for c in df.columns}, inplace=True)
-
-    dis_no_col = _col(df, "DisNo.", "Dis No", "DisNo", "Disaster No", "Disaster Number")
-    country_col = _col(df, "Country", "Country/Area", "Country / Area")
-    type_col = _col(df, "Disaster Type", "Disaster type", "Type")
-    subtype_col = _col(df, "Disaster Subtype", "Disaster subtype", "Disaster Sub-type", "SubType", "Disaster Sub Type")
-
-    sy_col = _col(df, "Start Year", "Start year", "Year")
-    sm_col = "Start Month" if "Start Month" in df.columns else ("Start month" if "Start month" in df.columns else None)
-    sd_col = "Start Day" if "Start Day" in df.columns else ("Start day" if "Start day" in df.columns else None)
-
-    ey_col = "End Year" if "End Year" in df.columns else ("End year" if "End year" in df.columns else None)
-    em_col = "End Month" if "End Month" in df.columns else ("End month" if "End month" in df.columns else None)
-    ed_col = "End Day" if "End Day" in df.columns else ("End day" if "End day" in df.columns else None)
-
-    deaths_col = "Total Deaths" if "Total Deaths" in df.columns else next((c for c in df.columns if _norm(c) in ("totaldeaths","deaths","totaldeath")), None)
-    affected_col = "Total Affected" if "Total Affected" in df.columns else next((c for c in df.columns if _norm(c) in ("totalaffected","affected")), None)
-
-    dmg_col = _damage_adjusted_column(df)
-
-    events: List[DisasterEvent] = []
-    for i, row in df.iterrows():
-        dmg = _to_float(row[dmg_col]) if dmg_col else None
-        if dmg is not None and dmg_col and "'000" in dmg_col:
-            dmg = dmg * 1000.0  # convert to US$
-
-        events.append(DisasterEvent(
-            event_id=i,
-            dis_no=_to_str(row[dis_no_col]),
-            country=_to_str(row[country_col]),
-            disaster_type=_to_str(row[type_col]),
-            disaster_subtype=_to_str(row[subtype_col]),
-            start_year=int(row[sy_col]),
-            start_month=_to_int(row[sm_col]) if sm_col else None,
-            start_day=_to_int(row[sd_col]) if sd_col else None,
-            end_year=_to_int(row[ey_col]) if ey_col else None,
-            end_month=_to_int(row[em_col]) if em_col else None,
-            end_day=_to_int(row[ed_col]) if ed_col else None,
-            total_deaths=_to_int(row[deaths_col]) if deaths_col else None,
-            total_affected=_to_int(row[affected_col]) if affected_col else None,
-            total_damage_adj_usd=dmg,
-        ))
-    return events
+    cache = path + ".parquet"
+    use_cache = _parquet_cache_enabled()
+    if use_cache and os.path.exists(cache) and os.path.getmtime(cache) >= os.path.getmtime(path):
+        try:
+            table = _read_cache(cache, path)
+            if table is not None:
+                return table
+        except _CACHE_ERRORS:
+            pass  # unreadable cache: parse the workbook again
+    table = _read_emdat_table(path)
+    if use_cache:
+        try:
+            _write_cache(table, cache, path)
+        except _CACHE_ERRORS:
+            pass  # the cache is best-effort (e.g. no write permission)
+    return table
+
+def _parquet_cache_enabled() -> bool:
+    import importlib.util
+    return (os.environ.get("ODIE_PARQUET_CACHE", "1") != "0"
+            and importlib.util.find_spec("pyarrow") is not None)
+
+# Bump when DisasterEventTable's columns or dtypes change: sidecars written
+# by an older ODIE then no longer match and are rebuilt.
+_CACHE_VERSION = 1
+_CACHE_KEY = b"odie_cache"
+# I/O problems and corrupt files (pyarrow's ArrowInvalid is a ValueError);
+# anything else is a bug and should surface
+_CACHE_ERRORS = (OSError, ImportError, ValueError)
+
+def _cache_stamp(path: str) -> bytes:
+    """Cache format version + workbook size, stored in the sidecar's metadata."""
+    return f"v{_CACHE_VERSION}:{os.path.getsize(path)}".encode()
+
+def _read_cache(cache: str, path: str) -> Optional[DisasterEventTable]:
+    """The cached table, or None if it was written for another format or workbook."""
+    import pyarrow.parquet as pq
+    t = pq.read_table(cache)
+    if (t.schema.metadata or {}).get(_CACHE_KEY) != _cache_stamp(path):
+        return None
+    return DisasterEventTable.from_frame(t.to_pandas())
+
+def _write_cache(table: DisasterEventTable, cache: str, path: str) -> None:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    t = pa.Table.from_pandas(table.to_frame(), preserve_index=False)
+    t = t.replace_schema_metadata({**(t.schema.metadata or {}), _CACHE_KEY: _cache_stamp(path)})
+    pq.write_table(t, cache, compression="zstd")
+
+def _read_emdat_table(path: str) -> DisasterEventTable:
+    """Parse the workbook itself (no cache)."""
+    engine = _excel_engine()
+    # Resolve column aliases from the header row alone (stripped names)
+    original = {str(c).strip(): c for c in pd.read_excel(path, nrows=0, engine=engine).columns}
+    h = _Header(list(original))
+
+    dis_no_col = h.col("DisNo.", "Dis No", "DisNo", "Disaster No", "Disaster Number")
+    country_col = h.col("Country", "Country/Area", "Country / Area")
+    type_col = h.col("Disaster Type", "Disaster type", "Type")
+    subtype_col = h.col("Disaster Subtype", "Disaster subtype", "Disaster Sub-type", "SubType", "Disaster Sub Type")
+
+    sy_col = h.col("Start Year", "Start year", "Year")
+    sm_col = h.exact_col("Start Month", "Start month")
+    sd_col = h.exact_col("Start Day", "Start day")
+
+    ey_col = h.exact_col("End Year", "End year")
+    em_col = h.exact_col("End Month", "End month")
+    ed_col = h.exact_col("End Day", "End day")
+
+    deaths_col = h.exact_col("Total Deaths") or h.first_with_norm("totaldeaths", "deaths", "totaldeath")
+    affected_col = h.exact_col("Total Affected") or h.first_with_norm("totalaffected", "affected")
+
+    dmg_col = h.damage_adjusted_col()
+
+    # Read only the columns we use; text columns skip type inference
+    wanted = [c for c in (dis_no_col, country_col, type_col, subtype_col, sy_col, sm_col, sd_col,
+                          ey_col, em_col, ed_col, deaths_col, affected_col, dmg_col) if c is not None]
+    text = (dis_no_col, country_col, type_col, subtype_col)
+    df = pd.read_excel(path, engine=engine, usecols=[original[c] for c in dict.fromkeys(wanted)],
+                       dtype={original[c]: str for c in text})
+    df.columns = [str(c).strip() for c in df.columns]
+
+    # Whole-column conversions: no per-row work at all
+    scale = 1000.0 if dmg_col and "'000" in dmg_col else 1.0  # convert to US$
+    # Blank or invalid start years become 0 instead of aborting the load
+    start_year = pd.to_numeric(df[sy_col], errors="coerce").fillna(0).to_numpy(dtype=np.int16)
+    return DisasterEventTable(
+        event_id=np.arange(len(df), dtype=np.int32),
+        dis_no=_str_col(df, dis_no_col),
+        country=_cat_col(df, country_col),
+        disaster_type=_cat_col(df, type_col),
+        disaster_subtype=_cat_col(df, subtype_col),
+        start_year=start_year,
+        start_month=_int_col(df, sm_col),
+        start_day=_int_col(df, sd_col),
+        end_year=_int_col(df, ey_col),
+        end_month=_int_col(df, em_col),
+        end_day=_int_col(df, ed_col),
+        total_deaths=_int_col(df, deaths_col),
+        total_affected=_int_col(df, affected_col),
+        total_damage_adj_usd=_float_col(df, dmg_col, scale),
+    )
@@ -3,18 +3,30 @@ Data model (DisasterEvent)
 =========================
 
 Each row in the EM-DAT Excel file is converted into a `DisasterEvent` object.
-We keep it immutable (`frozen=True`) so that:
+We keep it immutable (a `NamedTuple`) so that:
 - events cannot be accidentally modified after loading, and
 - filters/sorts operate by selecting IDs rather than editing data.
 
+A NamedTuple has no per-instance `__dict__` and is built by filling a tuple
+in C, which is noticeably faster than a frozen dataclass (one
+`object.__setattr__` per field) when loading one object per Excel row.
+
 This matches the project's goal: *offline analysis of a non-updating dataset*.
+
+`DisasterEventTable` holds the same data as a struct of arrays (one NumPy
+array per field). Scans that touch one or two fields then read only those
+arrays instead of every record; `to_events()` / `event(i)` give back the
+record form when it is needed.
 """
 
-from dataclasses import dataclass
-from typing import Optional
+from __future__ import annotations
+from dataclasses import dataclass, fields
+import sys
+from typing import Any, List, NamedTuple, Optional, Sequence, Union
+import numpy as np
+import pandas as pd
 
-@dataclass(frozen=True)
-class DisasterEvent:
+class DisasterEvent(NamedTuple):
     """One disaster event record.
 
     Fields are a curated subset of the Excel columns.
@@ -42,3 +54,144 @@ class DisasterEvent:
         m = self.start_month or 1
         d = self.start_day or 1
         return self.start_year * 10000 + m * 100 + d
+
+# Optional integer fields: stored as float64 in the table (NaN = missing)
+_OPT_INT_FIELDS = frozenset({"start_month", "start_day", "end_year", "end_month", "end_day",
+                             "total_deaths", "total_affected"})
+
+@dataclass
+class DisasterEventTable:
+    """The dataset as a struct of arrays: row i of every array is one event.
+
+    `country`, `disaster_type` and `disaster_subtype` are `pd.Categorical`:
+    a few hundred distinct strings repeated over every row, stored as small
+    integer codes plus one code book (`.categories`). `dis_no` is an object
+    array of str. Optional integer fields are float64 with NaN for missing
+    values (NumPy integers have no NaN).
+    """
+    event_id: np.ndarray            # int32
+    dis_no: np.ndarray
+    country: pd.Categorical
+    disaster_type: pd.Categorical
+    disaster_subtype: pd.Categorical
+    start_year: np.ndarray          # int16
+    start_month: np.ndarray
+    start_day: np.ndarray
+    end_year: np.ndarray
+    end_month: np.ndarray
+    end_day: np.ndarray
+    total_deaths: np.ndarray
+    total_affected: np.ndarray
+    total_damage_adj_usd: np.ndarray  # float64, US$
+
+    def __len__(self) -> int:
+        return len(self.event_id)
+
+    def filter(self, mask: Union[np.ndarray, slice]) -> DisasterEventTable:
+        """Sub-table of the rows picked by a boolean mask, index array or slice."""
+        return DisasterEventTable(**{f.name: getattr(self, f.name)[mask] for f in fields(self)})
+
+    def to_frame(self) -> pd.DataFrame:
+        """One DataFrame column per field (dtypes kept, categoricals included)."""
+        return pd.DataFrame({f.name: getattr(self, f.name) for f in fields(self)})
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> DisasterEventTable:
+        """Inverse of `to_frame`."""
+        cols = {}
+        for f in fields(cls):
+            s = df[f.name]
+            if f.name in ("country", "disaster_type", "disaster_subtype"):
+                cols[f.name] = pd.Categorical(s)
+            elif f.name == "dis_no":
+                cols[f.name] = s.to_numpy(dtype=object)
+            elif f.name == "event_id":
+                cols[f.name] = s.to_numpy(dtype=np.int32)
+            elif f.name == "start_year":
+                cols[f.name] = s.to_numpy(dtype=np.int16)
+            else:
+                cols[f.name] = s.to_numpy(dtype=np.float64)
+        return cls(**cols)
+
+    @classmethod
+    def from_events(cls, events: Sequence[DisasterEvent]) -> DisasterEventTable:
+        """Inverse of `to_events`: transpose records into one array per field.
+
+        Useful when the same records feed several column-wise computations
+        (e.g. reports): the transposition is paid once.
+        """
+        cols = dict(zip(DisasterEvent._fields, zip(*events))) if events else {}
+        out = {}
+        for f in fields(cls):
+            vals = cols.get(f.name, ())
+            if f.name in ("country", "disaster_type", "disaster_subtype"):
+                out[f.name] = pd.Categorical(list(vals))
+            elif f.name == "dis_no":
+                out[f.name] = np.array(vals, dtype=object)
+            elif f.name == "event_id":
+                out[f.name] = np.array(vals, dtype=np.int32)
+            elif f.name == "start_year":
+                out[f.name] = np.array(vals, dtype=np.int16)
+            else:
+                out[f.name] = np.array([np.nan if v is None else v for v in vals], dtype=np.float64)
+        return cls(**out)
+
+    def event(self, i: int) -> DisasterEvent:
+        """Row i as a DisasterEvent."""
+        return DisasterEvent(*(_to_py(name, getattr(self, name)[i]) for name in DisasterEvent._fields))
+
+    def start_date_keys(self) -> np.ndarray:
+        """`DisasterEvent.start_date_key()` for every row at once."""
+        return start_date_keys(self.start_year, self.start_month, self.start_day)
+
+    def to_events(self, workers: int = 1) -> List[DisasterEvent]:
+        """All rows as DisasterEvent records (converted column by column).
+
+        With `workers > 1` the rows are split into contiguous chunks that are
+        converted in a process pool (the sub-tables are plain arrays, cheap to
+        pickle). This only pays off on very large tables; note that strings
+        are then shared per chunk rather than across the whole table.
+        """
+        if workers > 1 and len(self) > workers:
+            from concurrent.futures import ProcessPoolExecutor
+            bounds = np.linspace(0, len(self), workers + 1).astype(int)
+            chunks = [self.filter(slice(lo, hi)) for lo, hi in zip(bounds[:-1], bounds[1:])]
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                return [e for part in pool.map(DisasterEventTable.to_events, chunks) for e in part]
+        cols = []
+        for name in DisasterEvent._fields:
+            col = getattr(self, name)
+            if isinstance(col, pd.Categorical):
+                # One interned str per category, shared by every row that uses
+                # it: less memory, and == between equal names is an identity check
+                book = [sys.intern(str(c)) for c in col.categories]
+                cols.append([book[k] for k in col.codes.tolist()])
+                continue
+            vals = col.tolist()
+            if name in _OPT_INT_FIELDS:
+                vals = [None if v != v else int(v) for v in vals]
+            elif name == "total_damage_adj_usd":
+                vals = [None if v != v else v for v in vals]
+            cols.append(vals)
+        return [DisasterEvent(*row) for row in zip(*cols)]
+
+def start_date_keys(year: np.ndarray, month: np.ndarray, day: np.ndarray) -> np.ndarray:
+    """Vectorized `start_date_key`: int64 YYYYMMDD keys for whole columns.
+
+    Missing (NaN) or zero months / days count as 1, like `start_month or 1`.
+    """
+    m = np.where(np.isnan(month) | (month == 0), 1, month).astype(np.int64)
+    d = np.where(np.isnan(day) | (day == 0), 1, day).astype(np.int64)
+    return year.astype(np.int64) * 10000 + m * 100 + d
+
+def _to_py(name: str, v: Any) -> Any:
+    """Convert one table cell back to the type DisasterEvent uses."""
+    if name in _OPT_INT_FIELDS:
+        return None if v != v else int(v)
+    if name == "total_damage_adj_usd":
+        return None if v != v else float(v)
+    if name in ("event_id", "start_year"):
+        return int(v)
+    if name in ("country", "disaster_type", "disaster_subtype"):
+        return sys.intern(v)
+    return v
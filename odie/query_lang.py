@@ -6,33 +6,45 @@ ODIE supports a small SQL-like boolean expression language for the `where` comma
 Examples:
 - where year >= 2000 and deaths > 1000
 - where country == "India" and subtype == "Ground movement"
+- where TRUE / where 1 = 1 / where FALSE   (constant clauses, as emitted by query builders)
 
 This file provides:
 - Tokenizer (turns text into tokens)
 - Parser (builds an AST = abstract syntax tree)
-- AST node classes (And/Or/Cmp)
+- AST node classes (And/Or/Cmp/Const)
+- optimize (folds constant and contradictory clauses, e.g. year > 2000 and year < 1990)
+- compile_predicate (turns an AST into one `event -> bool` function)
+- compile_mask (turns an AST into one `DisasterEventTable -> bool mask` function)
 """
 
 from __future__ import annotations
-from dataclasses import dataclass
-from typing import Any, List, Optional
+from dataclasses import dataclass, field
+from functools import lru_cache, reduce
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from operator import attrgetter
+import codecs
+import math
+import operator
 import re
+import sys
+import numpy as np
 
 # Simple expression language:
 # expr := term (OR term)*
 # term := factor (AND factor)*
-# factor := comparison | "(" expr ")"
-# comparison := IDENT (OP | contains) VALUE
-# OP := == != >= <= > <
+# factor := comparison | TRUE | FALSE | "(" expr ")"
+# comparison := (IDENT | LITERAL) (OP | contains) VALUE
+# OP := == = != >= <= > <      ("=" means "==")
 # VALUE := number | quoted string | bareword
+# LITERAL := number | quoted string  (literal-vs-literal folds to TRUE/FALSE)
 
 _TOKEN_RE = re.compile(
     r"""
     \s*(?:
         (?P<LPAREN>\() |
         (?P<RPAREN>\)) |
-        (?P<OP>==|!=|>=|<=|>|<) |
-        (?P<KW>\bAND\b|\bOR\b|\bcontains\b) |
+        (?P<OP>==|!=|>=|<=|=|>|<) |
+        (?P<KW>\bAND\b|\bOR\b|\bcontains\b|\bTRUE\b|\bFALSE\b) |
         (?P<NUMBER>-?\d+(?:\.\d+)?) |
         (?P<STRING>"([^"\\]|\\.)*"|'([^'\\]|\\.)*') |
         (?P<IDENT>[A-Za-z_][A-Za-z0-9_]*)
@@ -41,7 +53,7 @@ _TOKEN_RE = re.compile(
     re.VERBOSE | re.IGNORECASE
 )
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Token:
     kind: str
     value: str
@@ -49,72 +61,106 @@ class Token:
 class ParseError(ValueError):
     pass
 
-def tokenize(s: str) -> List[Token]:
+@lru_cache(maxsize=256)
+def tokenize(s: str) -> Tuple[Token, ...]:
     """Tokenize an input string into Token objects.
 
     This is the first step of parsing: it recognizes numbers, identifiers,
-    operators, parentheses, and quoted strings.
+    operators, parentheses, and quoted strings. Results are memoized by
+    input text (a tuple, so the cached value cannot be modified).
     """
+    return tuple(_tokenize(s))
+
+def _tokenize(s: str) -> List[Token]:
+    # finditer walks the string inside the regex engine; we only check that
+    # consecutive matches touch (a gap is text no token pattern accepts)
     pos = 0
     out: List[Token] = []
-    while pos < len(s):
-        m = _TOKEN_RE.match(s, pos)
-        if not m:
-            raise ParseError(f"Unexpected character near: {s[pos:pos+20]!r}")
+    for m in _TOKEN_RE.finditer(s):
+        if m.start() != pos:
+            break
         pos = m.end()
-        kind = None
-        val = None
-        for k, v in m.groupdict().items():
-            if v is not None and k not in ("STRING",):
-                kind = k
-                val = v
-                break
-        if m.group("STRING") is not None:
-            kind = "STRING"
-            val = m.group("STRING")
+        # lastgroup is the named group that matched (the inner groups of
+        # STRING are unnamed, so a string reports "STRING")
+        kind = m.lastgroup
         if kind is None:
             raise ParseError("Tokenizer error.")
+        val = m.group(kind)
         if kind == "KW":
             vnorm = val.lower()
             if vnorm in ("and", "or"):
                 kind = vnorm.upper()
                 val = vnorm.upper()
+            elif vnorm in ("true", "false"):
+                kind = vnorm.upper()  # keep the original text as value
             else:
                 kind = "CONTAINS"
                 val = "contains"
         out.append(Token(kind=kind, value=val))
+    if pos != len(s):
+        raise ParseError(f"Unexpected character near: {s[pos:pos+20]!r}")
     return out
 
 # AST nodes
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Node: ...
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class And(Node):
     left: Node
     right: Node
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Or(Node):
     left: Node
     right: Node
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Cmp(Node):
     field: str
-    op: str
+    op: str      # operator text, used by the engine to pick an index
     value: Any
+    # Comparison function for `op` (from _OPS), resolved once at parse time
+    fn: Optional[Callable[[Any, Any], bool]] = field(default=None, compare=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.fn is None:
+            object.__setattr__(self, "fn", _OPS.get(self.op))
+
+@dataclass(frozen=True, slots=True)
+class Const(Node):
+    """A clause that is always true or always false (TRUE, FALSE, 1 = 1, ...)."""
+    value: bool
 
+# Comparison operators, shared by constant folding
+_OPS = {
+    "==": operator.eq, "!=": operator.ne,
+    ">=": operator.ge, "<=": operator.le,
+    ">": operator.gt, "<": operator.lt,
+    "contains": lambda a, b: str(b).lower() in str(a).lower(),
+}
+
+@lru_cache(maxsize=256)
 def parse(expr: str) -> Node:
+    """Parse an expression string into an AST.
+
+    Results are memoized by expression text: REPL users and scripts often
+    repeat the same predicate, and the AST nodes are frozen dataclasses, so
+    one tree can safely be shared by every caller. Parse errors are raised
+    again on every call (lru_cache does not store exceptions).
+    """
+    return _parse(expr)
+
+def _parse(expr: str) -> Node:
     toks = tokenize(expr)
     p = _Parser(toks)
     node = p.parse_expr()
     if not p.at_end():
         raise ParseError(f"Unexpected token: {p.peek().value}")
-    return node
+    return optimize(node)
 
 class _Parser:
-    def __init__(self, toks: List[Token]) -> None:
+    def __init__(self, toks: Tuple[Token, ...]) -> None:
         self.toks = toks
         self.i = 0
 
@@ -161,19 +207,38 @@ class _Parser:
             node = self.parse_expr()
             self.take("RPAREN")
             return node
+        if self.match("TRUE"):
+            return Const(True)
+        if self.match("FALSE"):
+            return Const(False)
         return self.parse_comparison()
 
     def parse_comparison(self) -> Node:
-        field = self.take("IDENT").value
+        lit = self.match("NUMBER", "STRING")
+        field = None if lit else self.take("IDENT").value
         if self.match("CONTAINS"):
             op = "contains"
         else:
             op = self.take("OP").value
-        val_tok = self.match("NUMBER", "STRING", "IDENT")
+            if op == "=":
+                op = "=="
+        if lit:
+            # Literal on both sides (e.g. 1 = 1): decide it now. A field or
+            # TRUE/FALSE on the right ("India" == country) is an error.
+            val_tok = self.match("NUMBER", "STRING")
+            if not val_tok:
+                got = "end of input" if self.at_end() else f"{self.peek().kind} ({self.peek().value})"
+                raise ParseError(f"Expected NUMBER or STRING after {lit.value} {op}, got {got}")
+            val = _coerce_value(val_tok)
+            left = _coerce_value(lit)
+            try:
+                return Const(bool(_OPS[op](left, val)))
+            except TypeError:
+                raise ParseError(f"Cannot compare {left!r} {op} {val!r}") from None
+        val_tok = self.match("NUMBER", "STRING", "IDENT", "TRUE", "FALSE")
         if not val_tok:
             raise ParseError("Expected a value after operator")
-        val = _coerce_value(val_tok)
-        return Cmp(field=field, op=op, value=val)
+        return Cmp(field=field, op=op, value=_coerce_value(val_tok), fn=_OPS[op])
 
 def _coerce_value(tok: Token) -> Any:
     if tok.kind == "NUMBER":
@@ -182,6 +247,245 @@ def _coerce_value(tok: Token) -> Any:
         s = tok.value
         if s[0] == s[-1] and s[0] in ("'", '"'):
             s = s[1:-1]
-        s = s.encode("utf-8").decode("unicode_escape")
-        return s
+        if "\\" not in s:
+            return sys.intern(s)  # nothing to unescape (the common case)
+        return sys.intern(codecs.decode(s, "unicode_escape"))
     return tok.value
+
+# ---------------- Optimizer ----------------
+# Numeric where-fields, keyed by the column they read (so year/start_year
+# share one range); the flag says the values are whole numbers
+_RANGE_FIELDS: Dict[str, bool] = {
+    "start_year": True,
+    "total_deaths": True,
+    "total_affected": True,
+    "total_damage_adj_usd": False,
+}
+
+def optimize(node: Node) -> Node:
+    """Simplify an AST before it is evaluated.
+
+    - TRUE/FALSE operands are folded away: `TRUE AND x` -> x,
+      `FALSE AND x` -> FALSE, `TRUE OR x` -> TRUE, `FALSE OR x` -> x.
+    - The numeric comparisons of one AND group are collected per field into
+      an interval; if no value fits (`year >= 2000 and year < 1900`,
+      `deaths == 5 and deaths == 6`) the whole group becomes FALSE.
+
+    A query that folds to a constant is then answered without looking at a
+    single event.
+    """
+    if isinstance(node, And):
+        parts: List[Node] = []
+        for c in _conjuncts(node):
+            c = optimize(c)
+            if isinstance(c, Const):
+                if not c.value:
+                    return c
+                continue
+            parts.append(c)
+        if not parts:
+            return Const(True)
+        if _ranges_empty(parts):
+            return Const(False)
+        return reduce(And, parts)
+    if isinstance(node, Or):
+        parts = []
+        for d in _disjuncts(node):
+            d = optimize(d)
+            if isinstance(d, Const):
+                if d.value:
+                    return d
+                continue
+            parts.append(d)
+        return reduce(Or, parts) if parts else Const(False)
+    if isinstance(node, Cmp) and _ranges_empty([node]):
+        return Const(False)  # e.g. year == 2000.5
+    return node
+
+def _conjuncts(node: Node) -> List[Node]:
+    if isinstance(node, And):
+        return _conjuncts(node.left) + _conjuncts(node.right)
+    return [node]
+
+def _disjuncts(node: Node) -> List[Node]:
+    if isinstance(node, Or):
+        return _disjuncts(node.left) + _disjuncts(node.right)
+    return [node]
+
+def _ranges_empty(parts: List[Node]) -> bool:
+    """True if the numeric comparisons among `parts` leave no possible value.
+
+    Each field keeps a lower and an upper bound as (value, strict). Missing
+    numbers compare as -1, which is still one value, so the test holds for
+    them as well.
+    """
+    bounds: Dict[str, list] = {}
+    for c in parts:
+        if not isinstance(c, Cmp) or c.op in ("!=", "contains"):
+            continue
+        v = c.value
+        if isinstance(v, bool) or not isinstance(v, (int, float)):
+            continue
+        col = _TABLE_COLUMNS.get(c.field.lower(), (None, None))[0]
+        if col not in _RANGE_FIELDS:
+            continue
+        whole = _RANGE_FIELDS[col]
+        if whole and c.op == "==" and v != int(v):
+            return True  # a whole-number field never equals 2.5
+        b = bounds.setdefault(col, [(float("-inf"), False), (float("inf"), False)])
+        lo, hi = None, None
+        if c.op in (">=", ">", "=="):
+            lo = (v, c.op == ">")
+            if whole:  # > 1.5 and >= 1.5 both mean >= 2 for whole numbers
+                lo = (math.floor(v) + 1 if c.op == ">" else math.ceil(v), False)
+        if c.op in ("<=", "<", "=="):
+            hi = (v, c.op == "<")
+            if whole:
+                hi = (math.ceil(v) - 1 if c.op == "<" else math.floor(v), False)
+        # Keep the tighter bound (at equal values, strict is tighter)
+        if lo is not None and (lo[0], lo[1]) > b[0]:
+            b[0] = lo
+        if hi is not None and (hi[0], not hi[1]) < (b[1][0], not b[1][1]):
+            b[1] = hi
+        (lv, ls), (hv, hs) = b
+        if lv > hv or (lv == hv and (ls or hs)):
+            return True
+    return False
+
+# ---------------- Predicate compiler ----------------
+def _none_as(getter: Callable[[Any], Any], missing: Any) -> Callable[[Any], Any]:
+    """Wrap a numeric getter so missing values (None) compare as `missing`."""
+    def get(e: Any) -> Any:
+        v = getter(e)
+        return v if v is not None else missing
+    return get
+
+# where-field -> accessor, resolved once per predicate (not once per row)
+_FIELD_GETTERS: Dict[str, Callable[[Any], Any]] = {
+    "country": attrgetter("country"),
+    "type": attrgetter("disaster_type"),
+    "disaster_type": attrgetter("disaster_type"),
+    "subtype": attrgetter("disaster_subtype"),
+    "disaster_subtype": attrgetter("disaster_subtype"),
+    "start_year": attrgetter("start_year"),
+    "year": attrgetter("start_year"),
+    "total_deaths": _none_as(attrgetter("total_deaths"), -1),
+    "deaths": _none_as(attrgetter("total_deaths"), -1),
+    "total_affected": _none_as(attrgetter("total_affected"), -1),
+    "affected": _none_as(attrgetter("total_affected"), -1),
+    "damage": _none_as(attrgetter("total_damage_adj_usd"), -1.0),
+    "total_damage_adj_usd": _none_as(attrgetter("total_damage_adj_usd"), -1.0),
+    "damages": _none_as(attrgetter("total_damage_adj_usd"), -1.0),
+    "dis_no": attrgetter("dis_no"),
+    "disno": attrgetter("dis_no"),
+}
+
+def compile_predicate(node: Node) -> Callable[[Any], bool]:
+    """Compile an AST into one Python function `event -> bool`.
+
+    The tree is walked once, here: And/Or become nested closures and each
+    comparison binds its field accessor and value up front. Filtering N
+    events then costs N calls of the closure, with no per-event dispatch on
+    node types.
+    """
+    if isinstance(node, And):
+        left, right = compile_predicate(node.left), compile_predicate(node.right)
+        return lambda e: left(e) and right(e)
+    if isinstance(node, Or):
+        left, right = compile_predicate(node.left), compile_predicate(node.right)
+        return lambda e: left(e) or right(e)
+    if isinstance(node, Const):
+        value = node.value
+        return lambda e: value
+    if not isinstance(node, Cmp):
+        raise ValueError("Unknown AST node")
+    return _compile_cmp(node)
+
+def _compile_cmp(cmp: Cmp) -> Callable[[Any], bool]:
+    fname = cmp.field.lower()
+    op = cmp.op
+    val = cmp.value
+
+    get = _FIELD_GETTERS.get(fname)
+    if get is None:
+        get = lambda e: getattr(e, fname, None)
+
+    if op == "contains":
+        sval = str(val).lower()
+        return lambda e: sval in str(get(e)).lower()
+
+    if op == "==": return lambda e: get(e) == val
+    if op == "!=": return lambda e: get(e) != val
+    if op == ">=": return lambda e: get(e) >= val
+    if op == "<=": return lambda e: get(e) <= val
+    if op == ">":  return lambda e: get(e) > val
+    if op == "<":  return lambda e: get(e) < val
+
+    raise ValueError(f"Unsupported operator: {op}")
+
+# where-field -> (DisasterEventTable column, value used for missing numbers)
+_TABLE_COLUMNS: Dict[str, Tuple[str, Any]] = {
+    "country": ("country", None),
+    "type": ("disaster_type", None),
+    "disaster_type": ("disaster_type", None),
+    "subtype": ("disaster_subtype", None),
+    "disaster_subtype": ("disaster_subtype", None),
+    "start_year": ("start_year", None),
+    "year": ("start_year", None),
+    "total_deaths": ("total_deaths", -1),
+    "deaths": ("total_deaths", -1),
+    "total_affected": ("total_affected", -1),
+    "affected": ("total_affected", -1),
+    "damage": ("total_damage_adj_usd", -1.0),
+    "total_damage_adj_usd": ("total_damage_adj_usd", -1.0),
+    "damages": ("total_damage_adj_usd", -1.0),
+    "dis_no": ("dis_no", None),
+    "disno": ("dis_no", None),
+}
+
+def compile_mask(node: Node) -> Callable[[Any], np.ndarray]:
+    """Compile an AST into one function `DisasterEventTable -> boolean mask`.
+
+    The vectorized twin of `compile_predicate` (same field names, missing
+    numbers compare as -1): each comparison is one NumPy operation over a
+    whole column, and And/Or combine the masks with & / |.
+    """
+    if isinstance(node, And):
+        left, right = compile_mask(node.left), compile_mask(node.right)
+        return lambda t: left(t) & right(t)
+    if isinstance(node, Or):
+        left, right = compile_mask(node.left), compile_mask(node.right)
+        return lambda t: left(t) | right(t)
+    if isinstance(node, Const):
+        value = node.value
+        return lambda t: np.full(len(t), value, dtype=bool)
+    if not isinstance(node, Cmp):
+        raise ValueError("Unknown AST node")
+    return _compile_cmp_mask(node)
+
+def _compile_cmp_mask(cmp: Cmp) -> Callable[[Any], np.ndarray]:
+    spec = _TABLE_COLUMNS.get(cmp.field.lower())
+    op = cmp.op
+    val = cmp.value
+
+    fn = cmp.fn
+    if op == "contains":
+        sval = str(val).lower()
+        test = lambda col: np.fromiter((sval in str(x).lower() for x in col), dtype=bool, count=len(col))
+    elif fn is not None:
+        test = lambda col: np.asarray(fn(col, val), dtype=bool)
+    else:
+        raise ValueError(f"Unsupported operator: {op}")
+
+    def mask(t: Any) -> np.ndarray:
+        if spec is None:
+            return test(np.full(len(t), None, dtype=object))  # unknown field: None, as getattr(e, f, None)
+        col = getattr(t, spec[0])
+        if hasattr(col, "categories"):
+            # Categorical: test each distinct value once, then spread the
+            # answers over the rows through the integer codes
+            return test(np.asarray(col.categories, dtype=object))[col.codes]
+        if spec[1] is not None:
+            col = np.where(np.isnan(col), spec[1], col)
+        return test(col)
+    return mask
@@ -15,13 +15,21 @@ Design goals:
 """
 
 from dataclasses import dataclass, field
-from typing import List, Optional, Sequence, Tuple
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+import heapq
+import io
 import os
+import sys
 import tempfile
 from collections import Counter
-import math
+from functools import partial
 
-from .models import DisasterEvent
+import numpy as np
+
+from .models import DisasterEvent, DisasterEventTable
+
+if TYPE_CHECKING:  # python-docx stays a lazy import at runtime
+    from docx.text.paragraph import Paragraph
 
 
 # -----------------------------
@@ -57,26 +65,219 @@ class ReportConfig:
     # Optional: list of CLI commands used to create the current result set
     command_log: Optional[List[str]] = None
 
+    # Worker processes used to render charts (1 = render in this process).
+    # Each worker pays matplotlib's import cost once, so this pays off for
+    # large scopes where drawing/saving dominates.
+    chart_workers: int = 1
+
+    # Chart resolution. Charts are embedded 6.5 inches wide, so 150 dpi is
+    # ~975 px: sharp on screen and paper, and much cheaper to rasterize and
+    # encode than 200+ dpi (cost grows with the square of the dpi).
+    dpi: int = 150
+
+    # Chart image format: "jpg" (default) or "png". JPEG encodes about twice
+    # as fast as PNG at this size; PNG keeps edges crisp if that matters more.
+    chart_format: str = "jpg"
+
 
 # -----------------------------
 # Helpers for clean numeric plots
 # -----------------------------
 
-def _safe_floats(values: Sequence[Optional[float]]) -> List[float]:
-    """Convert a list with Nones to clean floats (skip NaN/inf)."""
-    out: List[float] = []
-    for v in values:
-        if v is None:
-            continue
-        try:
-            fv = float(v)
-        except Exception:
-            continue
-        if math.isfinite(fv):
-            out.append(fv)
+def _safe_floats(values: Sequence[Optional[float]]) -> np.ndarray:
+    """Convert a list with Nones to a clean float64 array (skip None/NaN/inf).
+
+    np.fromiter fills the array in one C loop (None becomes NaN first), and
+    one boolean mask then drops every non-finite value.
+    """
+    arr = np.fromiter((np.nan if v is None else v for v in values), dtype=np.float64, count=len(values))
+    return arr[np.isfinite(arr)]
+
+
+@dataclass
+class _Collected:
+    """Everything the report reads from the events, gathered in one pass."""
+    years: np.ndarray
+    year_min: Optional[int]
+    year_max: Optional[int]
+    deaths: np.ndarray
+    affected: np.ndarray
+    damage: np.ndarray
+    # Category counts (blank names skipped)
+    c_country: Counter
+    c_type: Counter
+    c_subtype: Counter
+    # (Start Year, value) pairs for the scatter plots
+    xs_deaths: np.ndarray
+    ys_deaths: np.ndarray
+    xs_affected: np.ndarray
+    ys_affected: np.ndarray
+
+
+def _collect(events: Sequence[DisasterEvent]) -> _Collected:
+    """
+    Walk the events ONCE and extract every column the report uses.
+
+    The report used to loop over `events` once per statistic (years, deaths,
+    countries, scatter points, ...). One loop with local
+    lists does the same work with a single attribute lookup per field.
+    """
+    years: List[int] = []
+    deaths: List[float] = []
+    affected: List[float] = []
+    damage: List[float] = []
+    c_country: Counter = Counter()
+    c_type: Counter = Counter()
+    c_subtype: Counter = Counter()
+    xs_deaths: List[float] = []
+    ys_deaths: List[float] = []
+    xs_affected: List[float] = []
+    ys_affected: List[float] = []
+    ymin: Optional[int] = None
+    ymax: Optional[int] = None
+
+    for e in events:
+        y = e.start_year
+        d = e.total_deaths
+        a = e.total_affected
+        dmg = e.total_damage_adj_usd
+        if y is not None:
+            years.append(y)
+            # Running extremes: no extra min()/max() pass later
+            if ymin is None or y < ymin:
+                ymin = y
+            if ymax is None or y > ymax:
+                ymax = y
+        if d is not None:
+            deaths.append(d)
+            if y is not None:
+                xs_deaths.append(float(y))
+                ys_deaths.append(float(d))
+        if a is not None:
+            affected.append(a)
+            if y is not None:
+                xs_affected.append(float(y))
+                ys_affected.append(float(a))
+        if dmg is not None:
+            damage.append(dmg)
+        if e.country:
+            c_country[e.country] += 1
+        if e.disaster_type:
+            c_type[e.disaster_type] += 1
+        if e.disaster_subtype:
+            c_subtype[e.disaster_subtype] += 1
+
+    return _Collected(
+        years=np.asarray(years, dtype=np.int64),
+        year_min=ymin,
+        year_max=ymax,
+        deaths=_safe_floats(deaths),
+        affected=_safe_floats(affected),
+        damage=_safe_floats(damage),
+        c_country=c_country,
+        c_type=c_type,
+        c_subtype=c_subtype,
+        xs_deaths=np.asarray(xs_deaths, dtype=np.float64),
+        ys_deaths=np.asarray(ys_deaths, dtype=np.float64),
+        xs_affected=np.asarray(xs_affected, dtype=np.float64),
+        ys_affected=np.asarray(ys_affected, dtype=np.float64),
+    )
+
+
+def _collect_columns(columns: Dict[str, Any]) -> _Collected:
+    """
+    Same result as _collect, computed from columnar arrays (one array per
+    field, row i = event i) with whole-array NumPy operations: no Python
+    attribute access per event.
+
+    Expected keys:
+    - "years", "deaths", "affected", "damage": numbers, NaN = missing
+    - "country_ids", "type_ids", "subtype_ids": integer codes (-1 = blank)
+    - "country_labels", "type_labels", "subtype_labels": code -> name
+      (a list or a dict)
+    """
+    years_f = np.asarray(columns["years"], dtype=np.float64)
+    has_year = np.isfinite(years_f)
+    years = years_f[has_year].astype(np.int64)
+    deaths = np.asarray(columns["deaths"], dtype=np.float64)
+    affected = np.asarray(columns["affected"], dtype=np.float64)
+    damage = np.asarray(columns["damage"], dtype=np.float64)
+    has_deaths = np.isfinite(deaths)
+    has_affected = np.isfinite(affected)
+
+    return _Collected(
+        years=years,
+        year_min=int(years.min()) if years.size else None,
+        year_max=int(years.max()) if years.size else None,
+        deaths=deaths[has_deaths],
+        affected=affected[has_affected],
+        damage=damage[np.isfinite(damage)],
+        c_country=_count_codes(columns["country_ids"], columns["country_labels"]),
+        c_type=_count_codes(columns["type_ids"], columns["type_labels"]),
+        c_subtype=_count_codes(columns["subtype_ids"], columns["subtype_labels"]),
+        xs_deaths=years_f[has_year & has_deaths],
+        ys_deaths=deaths[has_year & has_deaths],
+        xs_affected=years_f[has_year & has_affected],
+        ys_affected=affected[has_year & has_affected],
+    )
+
+
+def _table_columns(table: DisasterEventTable) -> Dict[str, Any]:
+    """The `columns` arrays of a DisasterEventTable (no copies: its categorical
+    codes and code books are used as they are)."""
+    return {
+        "years": table.start_year,
+        "deaths": table.total_deaths,
+        "affected": table.total_affected,
+        "damage": table.total_damage_adj_usd,
+        "country_ids": table.country.codes,
+        "type_ids": table.disaster_type.codes,
+        "subtype_ids": table.disaster_subtype.codes,
+        "country_labels": list(table.country.categories),
+        "type_labels": list(table.disaster_type.categories),
+        "subtype_labels": list(table.disaster_subtype.categories),
+    }
+
+
+def _count_codes(ids: Any, labels: Any) -> Counter:
+    """
+    Counter of names from integer category codes (np.bincount, one C loop).
+
+    Names are inserted in order of first appearance, like counting event by
+    event, so most_common() breaks ties the same way. Blank names are skipped.
+    """
+    ids = np.asarray(ids, dtype=np.int64)
+    ids = ids[ids >= 0]
+    if ids.size == 0:
+        return Counter()
+    counts = np.bincount(ids)
+    codes, first = np.unique(ids, return_index=True)
+    out: Counter = Counter()
+    for code in codes[np.argsort(first)].tolist():
+        name = labels[code]
+        if name:
+            out[name] += int(counts[code])
     return out
 
 
+def _top_k_indices(values: Any, k: int) -> np.ndarray:
+    """
+    Row indices of the k largest values (NaN = missing), largest first.
+
+    np.partition finds the k-th largest value in O(N); only the rows at or
+    above it are sorted. Equal values keep row order (lower index first),
+    the same result as heapq.nlargest over the events.
+    """
+    v = np.asarray(values, dtype=np.float64)
+    idx = np.flatnonzero(~np.isnan(v))
+    if idx.size > k:
+        cut = -np.partition(-v[idx], k - 1)[k - 1]
+        above = idx[v[idx] > cut]
+        ties = idx[v[idx] == cut][:k - above.size]
+        idx = np.concatenate([above, ties])
+    return idx[np.lexsort((idx, -v[idx]))]
+
+
 def _choose_bins(n: int) -> int:
     """Simple bin heuristic (keeps charts readable for small samples)."""
     if n <= 20:
@@ -86,20 +287,247 @@ def _choose_bins(n: int) -> int:
     return 30
 
 
+# -----------------------------
+# Chart rendering
+# -----------------------------
+
+# A chart job is (kind, title, data). It holds only plain values and arrays,
+# so it can be pickled and sent to a worker process.
+_ChartJob = Tuple[str, str, Dict[str, Any]]
+
+
+# Encoder settings per chart format (handed to Pillow by savefig)
+_SAVE_KWARGS: Dict[str, Dict[str, Any]] = {
+    "jpg": {"quality": 85, "optimize": False, "progressive": False},
+    # Fast zlib level: PNG compression dominates the save once dpi is sane
+    "png": {"optimize": False, "compress_level": 1},
+}
+
+
+def _render_charts(jobs: List[_ChartJob], workers: int = 1, dpi: int = 150, fmt: str = "jpg") -> List[bytes]:
+    """Render every chart job and return the encoded images, in job order."""
+    render = partial(_render_chart, dpi=dpi, fmt=fmt)
+    workers = min(workers, len(jobs), os.cpu_count() or 1)
+    if workers <= 1:
+        return [render(job) for job in jobs]
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # map() yields results in submission order, so the report lists the
+        # charts exactly as a serial run would
+        return list(pool.map(render, jobs))
+
+
+# matplotlib.pyplot, imported once per process (see _pyplot)
+_plt: Any = None
+
+# One Figure per process, reused by every chart (see _chart_axes)
+_FIG_AX: Optional[Tuple[Any, Any]] = None
+
+# Fixed margins (fractions of the figure) for charts whose labels are known
+# in advance: axis titles plus numeric ticks. Setting them is free, while
+# tight_layout() has to measure every text extent on each chart.
+_CHART_MARGINS: Dict[str, float] = {"left": 0.12, "right": 0.97, "top": 0.92, "bottom": 0.12}
+
+
+def _pyplot() -> Any:
+    """
+    Import matplotlib.pyplot on the Agg backend (once per process).
+
+    ODIE only writes image files, so it needs no GUI: selecting Agg before
+    pyplot is imported skips backend auto-detection, which may load Qt/Tk
+    bindings. If the host program already imported pyplot, its backend is
+    left alone.
+    """
+    global _plt
+    if _plt is None:
+        # matplotlib keeps its font list in its cache folder; without a
+        # writable one it rebuilds that list (hundreds of ms) in every process
+        if "MPLCONFIGDIR" not in os.environ and not _writable_dir(_mpl_default_cache_dir()):
+            fallback = _private_cache_dir()
+            if fallback is not None:
+                os.environ["MPLCONFIGDIR"] = fallback
+        import matplotlib
+        if "matplotlib.pyplot" not in sys.modules:
+            matplotlib.use("Agg", force=True)
+        import matplotlib.pyplot as plt
+        _plt = plt
+    return _plt
+
+
+def _mpl_default_cache_dir() -> str:
+    """Where matplotlib caches its font list when MPLCONFIGDIR is not set."""
+    home = os.path.expanduser("~")
+    if sys.platform.startswith(("linux", "freebsd")):
+        return os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.join(home, ".cache"), "matplotlib")
+    return os.path.join(home, ".matplotlib")
+
+
+def _writable_dir(path: str) -> bool:
+    try:
+        os.makedirs(path, exist_ok=True)
+    except OSError:
+        return False
+    return os.access(path, os.W_OK)
+
+
+def _private_cache_dir() -> Optional[str]:
+    """
+    Per-user fallback cache folder under the temp dir (mode 0o700), or None.
+
+    The temp dir is shared by all users, so a folder that already exists is
+    only used if it belongs to this user and nobody else can write to it.
+    """
+    uid = os.getuid() if hasattr(os, "getuid") else None
+    suffix = str(uid) if uid is not None else os.environ.get("USERNAME", "user")
+    path = os.path.join(tempfile.gettempdir(), f"odie_mpl_cache-{suffix}")
+    try:
+        os.makedirs(path, mode=0o700, exist_ok=True)
+        st = os.stat(path)
+    except OSError:
+        return None
+    if uid is not None and (st.st_uid != uid or st.st_mode & 0o022):
+        return None
+    return path if os.access(path, os.W_OK) else None
+
+
+def _chart_axes() -> Tuple[Any, Any]:
+    """
+    Return this process's (figure, axes), cleared for a new chart.
+
+    Building a Figure and its canvas for every chart (plt.figure() +
+    plt.close()) costs more than drawing a small chart; clearing the axes
+    of one long-lived figure does not.
+    """
+    global _FIG_AX
+    if _FIG_AX is None:
+        _FIG_AX = _pyplot().subplots()
+    fig, ax = _FIG_AX
+    ax.clear()
+    # Reset the margins: a previous bar chart may have changed them
+    fig.subplots_adjust(**_CHART_MARGINS)
+    return fig, ax
+
+
+def _render_chart(job: _ChartJob, dpi: int = 150, fmt: str = "jpg") -> bytes:
+    """Draw one chart and return it as an encoded image (runs in any process).
+
+    The image is written to memory, not to a file: the DOCX embeds the bytes
+    directly, so no temporary files are written, re-read or left behind.
+    """
+    kind, title, data = job
+    fig, ax = _chart_axes()
+    if kind == "bar":
+        ax.bar(data["labels"], data["values"])
+        # Set on the labels themselves (not tick_params), so the rotation
+        # does not outlive ax.clear() and leak into the next chart
+        for label in ax.get_xticklabels():
+            label.set_rotation(45)
+            label.set_horizontalalignment("right")
+        ax.set_ylabel("Count")
+    elif kind == "scatter":
+        ax.scatter(data["x"], data["y"])
+        ax.set_xlabel(data["xlabel"])
+        ax.set_ylabel(data["ylabel"])
+    elif kind == "hist":
+        _hist_bars(ax, *np.histogram(data["x"], bins=_choose_bins(len(data["x"]))))
+        ax.set_xlabel(data["xlabel"])
+        ax.set_ylabel("Count")
+    elif kind == "hist_log10":
+        # Histogram with:
+        # - visible bin boundaries (edgecolor)
+        # - alternating bar colors (to visually separate ranges)
+        # - log10 transform to handle extreme outliers
+        patches = _hist_bars(ax, *_log10_histogram(data["x"]))
+        for i, p in enumerate(patches):
+            # User requested alternating colors
+            p.set_facecolor("C0" if i % 2 == 0 else "C1")
+        ax.set_xlabel(data["xlabel"])
+        ax.set_ylabel("Count")
+    else:
+        raise ValueError(f"Unknown chart kind: {kind}")
+    ax.set_title(title)
+    if kind == "bar":
+        # Category names (countries, subtypes) have unpredictable lengths:
+        # only these charts measure their labels to fit the margins
+        fig.tight_layout()
+    buf = io.BytesIO()
+    fig.savefig(buf, dpi=dpi, format=fmt, pil_kwargs=_SAVE_KWARGS[fmt])
+    return buf.getvalue()
+
+
+def _hist_bars(ax: Any, counts: np.ndarray, edges: np.ndarray):
+    """
+    Draw an already-binned histogram as bars (one bar per bin, with visible
+    edges). Binning is done beforehand by np.histogram / _log10_histogram:
+    equal-width bins, so each value's bin is computed directly, no search.
+    Returns the bar patches.
+    """
+    return ax.bar(edges[:-1], counts, width=np.diff(edges), align="edge",
+                  edgecolor="black", linewidth=0.8)
+
+
+def _log10_histogram(x: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """(counts, edges) of log10(x + 1) over _choose_bins equal-width bins.
+
+    The transform reuses one temporary (log10 is computed in place), so a
+    large column is copied once instead of twice before binning.
+    """
+    t = x + 1.0
+    np.log10(t, out=t)
+    return np.histogram(t, bins=_choose_bins(len(t)))
+
+
+# -----------------------------
+# DOCX helpers
+# -----------------------------
+
+# Vertical space of one empty 11 pt line. Sections are separated by paragraph
+# spacing of this size rather than by empty paragraphs (fewer XML elements
+# to build and save).
+_BLANK_LINE_PT = 13.5
+
+
+def _fast_table(doc: Any, header: Sequence[str], rows: Sequence[Sequence[str]]) -> Any:
+    """
+    Add a table (header row + text rows) to the document in one step.
+
+    add_table(rows=1) + add_row() + cell.text rebuilds the table's cell grid
+    on every row and every cell access. Here the whole table XML is created
+    once, with all its rows, and each cell's text is written straight into
+    its <w:tc> element (same XML as setting cell.text).
+    """
+    table = doc.add_table(rows=1 + len(rows), cols=len(header))
+    for tr, values in zip(table._tbl.tr_lst, [header, *rows]):
+        for tc, text in zip(tr.tc_lst, values):
+            tc.clear_content()
+            tc.add_p().add_r().text = text
+    return table
+
+
 # -----------------------------
 # Main entry point used by CLI
 # -----------------------------
 
 def generate_docx_report(
-    events: Sequence[DisasterEvent],
+    events: Union[Sequence[DisasterEvent], DisasterEventTable],
     out_path: str,
     *,
     config: Optional[ReportConfig] = None,
     scope_label: str = "Current Result Set",
+    columns: Optional[Dict[str, np.ndarray]] = None,
 ) -> str:
     """
     Generate a DOCX report + charts for a list of events.
 
+    `events` may also be a DisasterEventTable (struct of arrays, e.g. from
+    `load_emdat_table`). Its columns are then used directly (see below) and
+    only the rows shown in tables are turned into DisasterEvent records.
+
+    `columns` (optional) holds the same events as arrays, row i = events[i]
+    (keys: see _collect_columns). When given, statistics and top-k tables
+    are computed with NumPy over the arrays instead of a loop over the
+    events; `events` is then only read for the rows shown in tables.
+
     IMPORTANT:
     - This does NOT modify your Excel file.
     - ODIE loads data into memory and reports on that in-memory selection.
@@ -119,117 +547,100 @@ def generate_docx_report(
             "Install it with: python -m pip install python-docx"
         ) from e
 
-    try:
-        import matplotlib.pyplot as plt
-        import numpy as np
-    except ImportError as e:
+    # matplotlib itself is imported by _pyplot (it may set MPLCONFIGDIR first)
+    import importlib.util
+    if importlib.util.find_spec("matplotlib") is None:
         raise ImportError(
-            "Missing dependency: matplotlib (and numpy).\n"
-            "Install with: python -m pip install matplotlib numpy"
-        ) from e
+            "Missing dependency: matplotlib.\n"
+            "Install with: python -m pip install matplotlib"
+        )
 
     if not events:
         raise ValueError("No events to report on (result set is empty).")
 
     # -----------------------------
-    # 1) Compute stats + category counts
+    # 1) Compute stats + category counts (one pass over the events,
+    #    or whole-array operations on the columns)
     # -----------------------------
-    years = [e.start_year for e in events if e.start_year is not None]
-    deaths = _safe_floats([e.total_deaths for e in events])
-    affected = _safe_floats([e.total_affected for e in events])
-    damage = _safe_floats([e.total_damage_adj_usd for e in events])
+    # row(i) -> DisasterEvent, for the few rows printed in tables
+    row: Callable[[int], DisasterEvent]
+    if isinstance(events, DisasterEventTable):
+        if columns is None:
+            columns = _table_columns(events)
+        row = events.event
+    else:
+        row = events.__getitem__
 
-    countries = [e.country for e in events if e.country]
-    types = [e.disaster_type for e in events if e.disaster_type]
-    subtypes = [e.disaster_subtype for e in events if e.disaster_subtype]
+    if columns is not None:
+        n_rows = {len(v) for k, v in columns.items() if not k.endswith("_labels")}
+        if n_rows != {len(events)}:
+            raise ValueError("columns must have one row per event")
+        col = _collect_columns(columns)
+    else:
+        col = _collect(events)
+    years = col.years
+    deaths = col.deaths
+    affected = col.affected
+    damage = col.damage
 
-    c_country = Counter(countries)
-    c_type = Counter(types)
-    c_subtype = Counter(subtypes)
+    c_country = col.c_country
+    c_type = col.c_type
+    c_subtype = col.c_subtype
 
     unique_countries = len(c_country)
     unique_types = len(c_type)
 
-    year_min = min(years) if years else None
-    year_max = max(years) if years else None
+    year_min = col.year_min
+    year_max = col.year_max
 
     # -----------------------------
     # 2) Create charts (SMART selection)
     # -----------------------------
-    tmpdir = tempfile.mkdtemp(prefix="odie_report_")
-    # Each chart is: (title, file_path, why_this_chart)
-    chart_paths: List[Tuple[str, str, str]] = []
-
-    def _save(filename: str) -> str:
-        path = os.path.join(tmpdir, filename)
-        plt.tight_layout()
-        plt.savefig(path, dpi=200)
-        plt.close()
-        return path
-
-    def _bar(title: str, labels: List[str], values: List[int], why: str, filename: str) -> None:
-        plt.figure()
-        plt.bar(labels, values)
-        plt.xticks(rotation=45, ha="right")
-        plt.title(title)
-        plt.ylabel("Count")
-        chart_paths.append((title, _save(filename), why))
-
-    def _scatter(title: str, x: List[float], y: List[float], xlabel: str, ylabel: str, why: str, filename: str) -> None:
-        plt.figure()
-        plt.scatter(x, y)
-        plt.title(title)
-        plt.xlabel(xlabel)
-        plt.ylabel(ylabel)
-        chart_paths.append((title, _save(filename), why))
-
-    def _hist_log10_alternating(title: str, data: List[float], xlabel: str, why: str, filename: str) -> None:
-        """
-        Histogram with:
-        - visible bin boundaries (edgecolor)
-        - alternating bar colors (to visually separate ranges)
-        - log10 transform to handle extreme outliers
-        """
-        if not data:
+    # Charts are described first and rendered afterwards (see _render_charts),
+    # so independent charts can be drawn by several processes.
+    # Each job is (kind, title, data); whys[i] explains jobs[i].
+    jobs: List[_ChartJob] = []
+    whys: List[str] = []
+    fmt = config.chart_format.lower()
+    if fmt == "jpeg":
+        fmt = "jpg"
+    if fmt not in _SAVE_KWARGS:
+        raise ValueError(f"chart_format must be one of: {', '.join(_SAVE_KWARGS)}")
+
+    def _add_chart(kind: str, title: str, data: Dict[str, Any], why: str) -> None:
+        jobs.append((kind, title, data))
+        whys.append(why)
+
+    def _bar(title: str, labels: List[str], values: List[int], why: str) -> None:
+        _add_chart("bar", title, {"labels": labels, "values": values}, why)
+
+    def _scatter(title: str, x: np.ndarray, y: np.ndarray, xlabel: str, ylabel: str, why: str) -> None:
+        _add_chart("scatter", title, {"x": x, "y": y, "xlabel": xlabel, "ylabel": ylabel}, why)
+
+    def _hist_log10_alternating(title: str, data: np.ndarray, xlabel: str, why: str) -> None:
+        if data.size == 0:
             return
-        x = np.log10(np.array(data) + 1.0)
-        plt.figure()
-        counts, bins, patches = plt.hist(
-            x,
-            bins=_choose_bins(len(x)),
-            edgecolor="black",
-            linewidth=0.8,
-        )
-        for i, p in enumerate(patches):
-            # User requested alternating colors
-            p.set_facecolor("C0" if i % 2 == 0 else "C1")
-        plt.title(title)
-        plt.xlabel(xlabel)
-        plt.ylabel("Count")
-        chart_paths.append((title, _save(filename), why))
+        _add_chart("hist_log10", title, {"x": data, "xlabel": xlabel}, why)
 
     # Year distribution: histogram if enough unique years, else decade bar
-    if years:
-        if len(set(years)) >= 15:
-            plt.figure()
-            plt.hist([float(y) for y in years], bins=_choose_bins(len(years)), edgecolor="black", linewidth=0.8)
-            plt.title(f"Event distribution by Start Year ({scope_label})")
-            plt.xlabel("Start Year")
-            plt.ylabel("Count")
-            chart_paths.append((
+    if years.size:
+        years_arr = years
+        if np.unique(years_arr).size >= 15:
+            _add_chart(
+                "hist",
                 f"Event distribution by Start Year ({scope_label})",
-                _save("hist_years.png"),
-                "Histogram is suitable for showing how events are spread across years."
-            ))
+                {"x": years_arr.astype(np.float64), "xlabel": "Start Year"},
+                "Histogram is suitable for showing how events are spread across years.",
+            )
         else:
-            decades = sorted(set((y // 10) * 10 for y in years))
-            decade_counts = [sum(1 for y in years if (y // 10) * 10 == d) for d in decades]
+            # np.unique returns the sorted decades that occur together with
+            # their counts, with no empty buckets to filter out
+            decades, decade_counts = np.unique(years_arr // 10, return_counts=True)
             _bar(
                 f"Event count by Decade ({scope_label})",
-                [str(d) for d in decades],
-                decade_counts,
+                [str(d * 10) for d in decades.tolist()],
+                decade_counts.tolist(),
                 "Bar chart is clearer than a histogram when years are few or clustered.",
-                "bar_decade.png"
             )
 
     # Category charts:
@@ -242,7 +653,6 @@ def generate_docx_report(
             [k for k, _ in top_countries],
             [v for _, v in top_countries],
             "Bar charts are ideal for comparing category counts (countries).",
-            "top_countries.png"
         )
     else:
         top_sub = c_subtype.most_common(config.top_n)
@@ -252,7 +662,6 @@ def generate_docx_report(
                 [k for k, _ in top_sub],
                 [v for _, v in top_sub],
                 "When the subset is a single country/type, subtype comparison becomes informative.",
-                "top_subtypes.png"
             )
 
     if unique_types > 1:
@@ -262,60 +671,58 @@ def generate_docx_report(
             [k for k, _ in top_types],
             [v for _, v in top_types],
             "Bar charts are ideal for comparing category counts (disaster types).",
-            "top_types.png"
         )
 
     # Severity over time: scatter plots
-    if years and deaths:
-        xs = [float(e.start_year) for e in events if e.start_year is not None and e.total_deaths is not None]
-        ys = [float(e.total_deaths) for e in events if e.start_year is not None and e.total_deaths is not None]
-        if xs and ys:
+    if years.size and deaths.size:
+        xs, ys = col.xs_deaths, col.ys_deaths
+        if xs.size and ys.size:
             _scatter(
                 f"Total Deaths vs Start Year ({scope_label})",
                 xs, ys,
                 "Start Year", "Total Deaths",
                 "Scatter plot shows how severity changes over time without forcing bins.",
-                "scatter_deaths.png"
             )
 
-    if years and affected:
-        xs = [float(e.start_year) for e in events if e.start_year is not None and e.total_affected is not None]
-        ys = [float(e.total_affected) for e in events if e.start_year is not None and e.total_affected is not None]
-        if xs and ys:
+    if years.size and affected.size:
+        xs, ys = col.xs_affected, col.ys_affected
+        if xs.size and ys.size:
             _scatter(
                 f"Total Affected vs Start Year ({scope_label})",
                 xs, ys,
                 "Start Year", "Total Affected",
                 "Scatter plot highlights unusually large affected counts and trends across years.",
-                "scatter_affected.png"
             )
 
     # Severity distribution: histogram (log-scale, alternating colors)
-    if deaths:
+    if deaths.size:
         _hist_log10_alternating(
             f"Distribution of Total Deaths (log10 scale) ({scope_label})",
             deaths,
             "log10(Total Deaths + 1)",
             "Deaths are heavy-tailed. Log scale + bin boundaries improves readability.",
-            "hist_deaths_log.png"
         )
-    elif affected:
+    elif affected.size:
         _hist_log10_alternating(
             f"Distribution of Total Affected (log10 scale) ({scope_label})",
             affected,
             "log10(Total Affected + 1)",
             "Affected counts can be heavy-tailed. Log scale improves readability.",
-            "hist_affected_log.png"
         )
-    elif damage:
+    elif damage.size:
         _hist_log10_alternating(
             f"Distribution of Adjusted Damage (log10 scale) ({scope_label})",
             damage,
             "log10(Adjusted Damage + 1)",
             "Damage values often have extreme outliers. Log scale improves readability.",
-            "hist_damage_log.png"
         )
 
+    # Each chart is: (title, image_bytes, why_this_chart)
+    charts: List[Tuple[str, bytes, str]] = [
+        (job[1], image, why)
+        for job, image, why in zip(jobs, _render_charts(jobs, config.chart_workers, config.dpi, fmt), whys)
+    ]
+
     # -----------------------------
     # 3) Build DOCX report
     # -----------------------------
@@ -335,25 +742,35 @@ def generate_docx_report(
         r.font.size = Pt(size)
         p.alignment = WD_ALIGN_PARAGRAPH.CENTER
 
-    def _kv(key: str, value: str) -> None:
+    def _kv(key: str, value: str) -> Paragraph:
         p = doc.add_paragraph()
         r = p.add_run(f"{key}: ")
         r.bold = True
         p.add_run(value)
+        return p
+
+    def _gap(p: Paragraph, pts: float = _BLANK_LINE_PT) -> Paragraph:
+        """
+        Add `pts` of space above paragraph `p` (on top of its style's own
+        spacing) instead of inserting an empty spacer paragraph before it.
+        Returns `p`.
+        """
+        fmt = p.paragraph_format
+        base = fmt.space_before if fmt.space_before is not None else p.style.paragraph_format.space_before
+        fmt.space_before = Pt((base.pt if base is not None else 0) + pts)
+        return p
 
     _center_title(config.title, 22, bold=True)
     _center_title(config.subtitle, 12, italic=True)
 
-    doc.add_paragraph("")
-    _kv("Dataset", config.dataset_name)
+    _gap(_kv("Dataset", config.dataset_name))
     _kv("Scope", scope_label)
     _kv("Total records in scope", str(len(events)))
     if year_min is not None and year_max is not None:
         _kv("Year range (Start Year)", f"{year_min} to {year_max}")
 
     # Dataset citation section
-    doc.add_paragraph("")
-    doc.add_heading("Dataset citation", level=1)
+    _gap(doc.add_heading("Dataset citation", level=1))
     cit = config.citation
     if cit.file_name:
         doc.add_paragraph(f"Data file used: {cit.file_name}")
@@ -367,20 +784,15 @@ def generate_docx_report(
 
     # Command log (optional) for reproducibility
     if config.command_log:
-        doc.add_paragraph("")
-        doc.add_heading("Command log (reproducibility)", level=1)
+        _gap(doc.add_heading("Command log (reproducibility)", level=1))
         doc.add_paragraph("These ODIE commands produced this result set:")
         for line in config.command_log:
             doc.add_paragraph(line, style="List Bullet")
 
     # Data dictionary
-    doc.add_paragraph("")
-    doc.add_heading("Columns used (data dictionary)", level=1)
+    _gap(doc.add_heading("Columns used (data dictionary)", level=1))
     doc.add_paragraph("This report uses the following ODIE fields derived from dataset columns:")
-    t = doc.add_table(rows=1, cols=2)
-    t.rows[0].cells[0].text = "ODIE field"
-    t.rows[0].cells[1].text = "Meaning"
-    for k, v in [
+    _fast_table(doc, ["ODIE field", "Meaning"], [
         ("dis_no", "Unique disaster identifier"),
         ("country", "Country name"),
         ("disaster_type", "Major disaster category"),
@@ -389,117 +801,95 @@ def generate_docx_report(
         ("total_deaths", "Total deaths"),
         ("total_affected", "Total affected"),
         ("total_damage_adj_usd", "Adjusted damage (US$)"),
-    ]:
-        row = t.add_row().cells
-        row[0].text = k
-        row[1].text = v
+    ])
 
     # Data completeness summary (missingness)
-    doc.add_paragraph("")
-    doc.add_heading("Data completeness", level=1)
+    _gap(doc.add_heading("Data completeness", level=1))
     doc.add_paragraph("Availability of numeric fields in this scope:")
-    t2 = doc.add_table(rows=1, cols=3)
-    t2.rows[0].cells[0].text = "Metric"
-    t2.rows[0].cells[1].text = "Available"
-    t2.rows[0].cells[2].text = "Missing"
-
-    def _add_missing_row(name: str, getter) -> None:
-        vals = [getter(e) for e in events]
-        missing = sum(1 for v in vals if v is None)
-        available = len(events) - missing
-        row = t2.add_row().cells
-        row[0].text = name
-        row[1].text = str(available)
-        row[2].text = str(missing)
-
-    _add_missing_row("Total Deaths", lambda e: e.total_deaths)
-    _add_missing_row("Total Affected", lambda e: e.total_affected)
-    _add_missing_row("Adjusted Damage (US$)", lambda e: e.total_damage_adj_usd)
+
+    # The cleaned arrays hold exactly the available values, so their sizes
+    # give the counts without another pass over the events
+    _fast_table(doc, ["Metric", "Available", "Missing"], [
+        [name, str(values.size), str(len(events) - values.size)]
+        for name, values in [
+            ("Total Deaths", deaths),
+            ("Total Affected", affected),
+            ("Adjusted Damage (US$)", damage),
+        ]
+    ])
 
     # Visualizations
-    doc.add_paragraph("")
-    doc.add_heading("Visualizations", level=1)
-    for title, path, why in chart_paths:
+    _gap(doc.add_heading("Visualizations", level=1))
+    for title, image, why in charts:
         doc.add_paragraph(title)
-        doc.add_picture(path, width=Inches(6.5))
-        doc.add_paragraph("Why this graph is suitable: " + why)
-        doc.add_paragraph("")
+        doc.add_picture(io.BytesIO(image), width=Inches(6.5))
+        p = doc.add_paragraph("Why this graph is suitable: " + why)
+        p.paragraph_format.space_after = Pt(_BLANK_LINE_PT)
 
     # Key event tables (top-k by deaths/damage)
-    doc.add_paragraph("")
-    doc.add_heading("Key events tables", level=1)
-
-    top_by_deaths = sorted(
-        [e for e in events if e.total_deaths is not None],
-        key=lambda e: float(e.total_deaths),
-        reverse=True
-    )[:10]
+    _gap(doc.add_heading("Key events tables", level=1))
+
+    # heapq.nlargest keeps a 10-element heap: O(N log 10), no full sort
+    if columns is not None:
+        top_by_deaths = [row(i) for i in _top_k_indices(columns["deaths"], 10).tolist()]
+    else:
+        top_by_deaths = heapq.nlargest(
+            10,
+            (e for e in events if e.total_deaths is not None),
+            key=lambda e: e.total_deaths,
+        )
     if top_by_deaths:
         doc.add_paragraph("Top 10 events by Total Deaths (within scope)")
-        t3 = doc.add_table(rows=1, cols=7)
-        h = t3.rows[0].cells
-        h[0].text = "DisNo"
-        h[1].text = "Country"
-        h[2].text = "Type"
-        h[3].text = "Subtype"
-        h[4].text = "Year"
-        h[5].text = "Deaths"
-        h[6].text = "Adj. Damage (US$)"
-        for e in top_by_deaths:
-            r = t3.add_row().cells
-            r[0].text = e.dis_no
-            r[1].text = e.country
-            r[2].text = e.disaster_type
-            r[3].text = e.disaster_subtype
-            r[4].text = str(e.start_year if e.start_year is not None else "")
-            r[5].text = str(int(e.total_deaths)) if e.total_deaths is not None else ""
-            r[6].text = f"{int(e.total_damage_adj_usd):,}" if e.total_damage_adj_usd is not None else ""
-
-    top_by_damage = sorted(
-        [e for e in events if e.total_damage_adj_usd is not None],
-        key=lambda e: float(e.total_damage_adj_usd),
-        reverse=True
-    )[:10]
+        _fast_table(doc, ["DisNo", "Country", "Type", "Subtype", "Year", "Deaths", "Adj. Damage (US$)"], [
+            [
+                e.dis_no,
+                e.country,
+                e.disaster_type,
+                e.disaster_subtype,
+                str(e.start_year if e.start_year is not None else ""),
+                str(int(e.total_deaths)) if e.total_deaths is not None else "",
+                f"{int(e.total_damage_adj_usd):,}" if e.total_damage_adj_usd is not None else "",
+            ]
+            for e in top_by_deaths
+        ])
+
+    if columns is not None:
+        top_by_damage = [row(i) for i in _top_k_indices(columns["damage"], 10).tolist()]
+    else:
+        top_by_damage = heapq.nlargest(
+            10,
+            (e for e in events if e.total_damage_adj_usd is not None),
+            key=lambda e: e.total_damage_adj_usd,
+        )
     if top_by_damage:
-        doc.add_paragraph("")
-        doc.add_paragraph("Top 10 events by Adjusted Damage (US$) (within scope)")
-        t4 = doc.add_table(rows=1, cols=6)
-        h = t4.rows[0].cells
-        h[0].text = "DisNo"
-        h[1].text = "Year"
-        h[2].text = "Subtype"
-        h[3].text = "Adj. Damage (US$)"
-        h[4].text = "Deaths"
-        h[5].text = "Total Affected"
-        for e in top_by_damage:
-            r = t4.add_row().cells
-            r[0].text = e.dis_no
-            r[1].text = str(e.start_year if e.start_year is not None else "")
-            r[2].text = e.disaster_subtype
-            r[3].text = f"{int(e.total_damage_adj_usd):,}" if e.total_damage_adj_usd is not None else ""
-            r[4].text = str(int(e.total_deaths)) if e.total_deaths is not None else ""
-            r[5].text = str(int(e.total_affected)) if e.total_affected is not None else ""
+        _gap(doc.add_paragraph("Top 10 events by Adjusted Damage (US$) (within scope)"))
+        _fast_table(doc, ["DisNo", "Year", "Subtype", "Adj. Damage (US$)", "Deaths", "Total Affected"], [
+            [
+                e.dis_no,
+                str(e.start_year if e.start_year is not None else ""),
+                e.disaster_subtype,
+                f"{int(e.total_damage_adj_usd):,}" if e.total_damage_adj_usd is not None else "",
+                str(int(e.total_deaths)) if e.total_deaths is not None else "",
+                str(int(e.total_affected)) if e.total_affected is not None else "",
+            ]
+            for e in top_by_damage
+        ])
 
     # A small preview table (first N records)
-    doc.add_paragraph("")
-    doc.add_heading("Preview of first few records", level=1)
-    preview = list(events)[:config.max_rows_preview]
-    t5 = doc.add_table(rows=1, cols=6)
-    h = t5.rows[0].cells
-    h[0].text = "DisNo"
-    h[1].text = "Country"
-    h[2].text = "Type"
-    h[3].text = "Subtype"
-    h[4].text = "Year"
-    h[5].text = "Deaths"
-    for e in preview:
-        r = t5.add_row().cells
-        r[0].text = e.dis_no
-        r[1].text = e.country
-        r[2].text = e.disaster_type
-        r[3].text = e.disaster_subtype
-        r[4].text = str(e.start_year if e.start_year is not None else "")
-        r[5].text = str(int(e.total_deaths)) if e.total_deaths is not None else ""
+    _gap(doc.add_heading("Preview of first few records", level=1))
+    # Only the first N rows (no copy of the whole result set first)
+    preview = [row(i) for i in range(min(len(events), config.max_rows_preview))]
+    _fast_table(doc, ["DisNo", "Country", "Type", "Subtype", "Year", "Deaths"], [
+        [
+            e.dis_no,
+            e.country,
+            e.disaster_type,
+            e.disaster_subtype,
+            str(e.start_year if e.start_year is not None else ""),
+            str(int(e.total_deaths)) if e.total_deaths is not None else "",
+        ]
+        for e in preview
+    ])
     doc.add_heading("Notes", level=1)
     doc.add_paragraph(
         "ODIE does not modify the original Excel dataset. "
@@ -511,8 +901,7 @@ def generate_docx_report(
     # -----------------------------
     # Reproducibility footer (professional report touch)
     # -----------------------------
-    doc.add_paragraph("")
-    doc.add_heading("Reproducibility footer", level=1)
+    _gap(doc.add_heading("Reproducibility footer", level=1))
 
     # ODIE version (from the package)
     try:
@@ -538,13 +927,13 @@ def generate_docx_report(
             doc.add_paragraph(line, style="List Bullet")
 
     # Short algorithmic notes (ties report to DSA syllabus)
-    doc.add_paragraph("")
-    doc.add_paragraph("Algorithmic notes (DSA):")
+    _gap(doc.add_paragraph("Algorithmic notes (DSA):"))
     for note in [
         "Filtering uses precomputed indices (value -> sorted list of IDs) and list intersection.",
         "Year-range filtering uses binary search (bisect) over sorted years.",
-        "Sorting uses comparison-based sorting (merge sort / quick sort utilities).",
-        "Top-k queries use a heap (priority queue).",
+        "Sorting uses a stable argsort over columnar copies of the numeric fields "
+        "(merge sort / quick sort utilities with ODIE_DSA_PURE=1).",
+        "Top-k queries use partial selection (argpartition), then sort only the k results.",
         "Advanced 'where' filtering parses an expression into an AST (tree) and evaluates it."
     ]:
         doc.add_paragraph(note, style="List Bullet")